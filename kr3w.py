@@ -1,199 +1,921 @@
-import json
+import time
+_T0 = time.perf_counter()
+
 import os
-import argparse
 from datetime import date, timedelta
-import random
+
+import kr3w_engine
+import kr3w_model
+import kr3w_schedule
+import kr3w_store
+from kr3w_store import CHANNELS, content_hash, load_manifest, save_manifest
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+CFG_PATH = os.path.join(BASE_DIR, "kr3w_config.json")
+
+# Repo-relative paths written since the last scripts/publish.py commit
+PUBLISH_PENDING = os.path.join(BASE_DIR, "logs", "publish.pending")
+
 def load_config():
-    cfg_path = os.path.join(BASE_DIR, "kr3w_config.json")
-    with open(cfg_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return kr3w_model.load_config(CFG_PATH)
+
+class Timings:
+    """
+    Wall-clock checkpoints for --timings (import, config load, generate, ...).
+    """
+    def __init__(self):
+        self.enabled = False
+        self.stages = [("import", time.perf_counter() - _T0)]
+        self.last = time.perf_counter()
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.stages.append((stage, now - self.last))
+        self.last = now
+
+    def report(self):
+        if not self.enabled:
+            return
+        total = self.last - _T0
+        print("⏱  Timings")
+        for stage, secs in self.stages:
+            print(f"  {stage:<16} {secs * 1000:8.1f} ms")
+        print(f"  {'total':<16} {total * 1000:8.1f} ms")
 
 def ensure_dirs(*paths):
     for p in paths:
         os.makedirs(p, exist_ok=True)
 
-def pick(rng, items, fallback=""):
-    if not items:
-        return fallback
-    return rng.choice(items)
+def pick_theme_for_day(cfg, day: date):
+    """
+    Which theme runs on `day`, per the weekly rotation defined in
+    kr3w_config.json. Deterministic (see kr3w_schedule).
+    """
+    return cfg.themes_by_id[kr3w_engine.scheduled_theme_id(cfg, day)]
 
-def fmt_links(cfg):
-    links = cfg.get("links", {})
-    return links
+def build_assets(cfg, for_date: date, spans=None):
+    """
+    One day's six channels + meta, rendered by kr3w_engine from a single
+    per-day draw of theme/hook/CTA/link.
+    """
+    return kr3w_engine.render_day(cfg, for_date, spans=spans)
 
-def pick_theme_for_day(cfg, day: date):
+def write_assets(out_dir, assets, manifest=None, fingerprint="", force=False, dedup=False, spans=None,
+                 writer=None):
+    """
+    Writes the channel files for one day (every channel present in assets).
+    With a manifest, files whose content hash is unchanged and whose bytes
+    on disk still match are skipped; the manifest dict is updated in place,
+    including each file's size and mtime_ns. With dedup,
+    each file is a hardlink into the content-addressed blob store; files
+    written before dedup was turned on are relinked on the next run. With
+    spans, each written file is a "write_assets" span carrying its size.
+    Files are staged and renamed into place together once the whole day is
+    written. Pass a kr3w_store.BatchWriter to share one directory sync
+    across many days (the caller closes it); otherwise this call syncs.
+    Returns (written, skipped).
+    """
+    own = writer is None
+    if own:
+        writer = kr3w_store.BatchWriter()
+    try:
+        written, skipped, fresh = _stage_assets(out_dir, assets, manifest, fingerprint, force, dedup, spans,
+                                                writer)
+        t0 = time.perf_counter()
+        writer.publish()
+        if spans is not None:
+            spans.add("write_assets.publish", time.perf_counter() - t0)
+        # remember what each new file looks like on disk (see _still_on_disk)
+        for entry, path in fresh:
+            _stamp_entry(entry, os.stat(path))
+    except BaseException:
+        writer.discard()
+        raise
+    if own:
+        writer.sync()
+    return written, skipped
+
+def _stamp_entry(entry, st):
+    entry["size"] = st.st_size
+    entry["mtime_ns"] = st.st_mtime_ns
+
+def _still_on_disk(path, prev, data):
     """
-    Selects which theme to use based on the weekly rotation
-    defined in kr3w_config.json.
-    """
-
-    # Get weekday key: mon, tue, wed, etc.
-    dow = day.strftime("%a").lower()[:3]
-
-    rotation = cfg.get("weekly_rotation", {})
-    available_themes = {t["id"]: t for t in cfg.get("themes", [])}
-
-    # If this weekday has a defined rotation, use it
-    if dow in rotation and rotation[dow]:
-        chosen_id = random.choice(rotation[dow])
-        if chosen_id in available_themes:
-            return available_themes[chosen_id]
-
-    # Fallback: rotate through all themes safely
-    return random.choice(list(available_themes.values()))
-
-def build_assets(cfg, for_date: date):
-    # deterministic per-day output
-    rng = random.Random(for_date.isoformat())
-
-    brand = cfg.get("brand", {})
-    links = fmt_links(cfg)
-
-    # Defaults if not in config (we’ll expand this in Step 2)
-    hooks = cfg.get("hooks", [
-        "One Link. One Hub. Everything Connected.",
-        "If you’re building something real, you need one place that ties it all together.",
-        "Creators don’t need clutter. They need clarity."
-    ])
-    themes = cfg.get("themes", [
-        {"id": "hub", "label": "hub-first", "primary_link": "linktree"},
-        {"id": "merch", "label": "merch", "primary_link": "tiktok_shop"},
-        {"id": "wellness", "label": "wellness", "primary_link": "mydailychoice_daily_spray"},
-    ])
-    ctas = cfg.get("ctas", [
-        "Tap the hub 👇",
-        "Bookmark the hub and stay locked in 🔥",
-        "Start here 👇"
-    ])
-    hashtags = cfg.get("hashtags", ["#LinkInBio", "#CreatorLife", "#SmallBusiness"])
-
-    theme = pick(rng, themes, {"id":"hub","label":"hub-first","primary_link":"linktree"})
-    hook = pick(rng, hooks)
-    cta = pick(rng, ctas)
-    tag_str = " ".join(hashtags[:6])
-
-    primary_key = theme.get("primary_link", "linktree")
-    primary_url = links.get(primary_key, links.get("linktree", ""))
-
-    name = brand.get("name", "Sinist3rkr3w")
-    tagline = brand.get("tagline", "Where you matter most.")
-    sms_keyword = brand.get("sms_keyword", "KR3W")
-
-    # --- BLOG (markdown) ---
-    blog = []
-    blog.append(f"# {hook}\n")
-    blog.append(f"In today’s world, creators need one simple place where everything connects.\n")
-    blog.append(f"That’s why I use a central hub that keeps all my content, products, and updates together.\n")
-    blog.append(f"Whether you’re here for **{theme.get('label','everything')}**, it all starts in one place.\n")
-    blog.append(f"👉 {primary_url}\n")
-    blog.append("## Why this matters\n")
-    blog.append("People don’t want clutter. They want clarity.\n")
-    blog.append("One link. One destination. Everything connected.\n")
-    blog.append("## Final Thoughts\n")
-    blog.append(f"If you support independent creators and real hustle, bookmark the hub and stay tuned.\n")
-    blog_md = "\n".join(blog).strip() + "\n"
-
-    # --- FACEBOOK AD (short) ---
-    fb_ad = (
-        f"{name}: {tagline}\n\n"
-        f"{hook}\n"
-        f"One hub for merch, wellness, and updates.\n\n"
-        f"{cta}\n{primary_url}\n\n"
-        f"{tag_str}\n"
-    )
-
-    # --- TIKTOK CAPTION / AD ---
-    tt_ad = (
-        f"{hook}\n"
-        f"{cta} {primary_url}\n"
-        f"{tag_str}\n"
-    )
-
-    # --- SHORT CAPTION ---
-    caption = (
-        f"{hook}\n"
-        f"{primary_url}\n"
-        f"{tag_str}\n"
-    )
-    # --- YOUTUBE DESCRIPTION ---
-    yt = (
-         f"{hook}\n\n"
-         f"{cta}\n"
-         f"{primary_url}\n\n"
-         f"{tag_str}\n"
-    )
-
-    # --- SMS/DM CTA (opt-in style) ---
-    sms = (
-        f"{name}: {tagline}\n"
-        f"Want the hub link + updates? Reply '{sms_keyword}' and I’ll send it.\n"
-        f"{primary_url}\n"
-    )
-
-    return {
-        "blog": blog_md,
-        "ad_facebook": fb_ad,
-        "ad_tiktok": tt_ad,
-        "caption_short": caption,
-        "sms_cta": sms,
-        "youtube": yt,
-        "meta": {
-            "date": for_date.isoformat(),
-            "theme": theme,
-            "primary_link": primary_key,
-            "primary_url": primary_url
-        }
-    }
-
-def write_assets(out_dir, assets):
+    True when path still holds data. A file whose size and mtime_ns match
+    the manifest entry is trusted; anything else (a file another script
+    rewrote, or an entry from before stamps were kept) is read back and
+    compared. Returns the stat result, or None when the file must be
+    written.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    if st.st_size == prev.get("size") and st.st_mtime_ns == prev.get("mtime_ns"):
+        return st
+    if st.st_size != len(data):
+        return None
+    with open(path, "rb") as f:
+        return st if f.read() == data else None
+
+def _stage_assets(out_dir, assets, manifest, fingerprint, force, dedup, spans, writer):
+    # returns (written, skipped, [(manifest entry, path)] to stamp once published)
     d = assets["meta"]["date"]
-    def w(fname, content):
-        path = os.path.join(out_dir, fname)
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(content)
-
-    w(f"blog_{d}.md", assets["blog"])
-    w(f"ad_facebook_{d}.txt", assets["ad_facebook"])
-    w(f"ad_tiktok_{d}.txt", assets["ad_tiktok"])
-    w(f"caption_short_{d}.txt", assets["caption_short"])
-    w(f"sms_cta_{d}.txt", assets["sms_cta"])
-    w(f"youtube_{d}.txt", assets["youtube"])
+    written = skipped = 0
+    fresh = []
+    for key, prefix, suffix in CHANNELS:
+        if key not in assets:
+            continue
+        content = assets[key]
+        path = os.path.join(out_dir, f"{prefix}{d}{suffix}")
+        # encoded once: the same bytes are hashed and written
+        data = content.encode("utf-8")
+        h = content_hash(data) if manifest is not None or dedup else None
+
+        entry = None
+        if manifest is not None:
+            entry_key = f"{d}/{key}"
+            prev = manifest.get(entry_key)
+            entry = manifest[entry_key] = {"hash": h, "config": fingerprint}
+            st = _still_on_disk(path, prev, data) if not force and prev and prev.get("hash") == h else None
+            # under dedup an unchanged file that is not linked into the blob
+            # store yet (an archive written before dedup was on) is relinked
+            if st is not None and (not dedup or kr3w_store.is_linked(out_dir, h, path)):
+                _stamp_entry(entry, st)
+                skipped += 1
+                if spans is not None:
+                    spans.add("write_assets.skipped", 0.0)
+                continue
+
+        t0 = time.perf_counter()
+        if dedup and not kr3w_store.link_blob(out_dir, h, content, path, writer):
+            # already the right hardlink: nothing to write
+            if entry is not None:
+                _stamp_entry(entry, os.stat(path))
+            skipped += 1
+            if spans is not None:
+                spans.add("write_assets.skipped", 0.0)
+            continue
+        if not dedup:
+            writer.stage_bytes(path, data)
+        written += 1
+        if entry is not None:
+            fresh.append((entry, path))
+        if spans is not None:
+            spans.add("write_assets", time.perf_counter() - t0, len(data))
+    return written, skipped, fresh
+
+def generate_day(cfg, out_dir, day: date, manifest=None, fingerprint="", force=False, dedup=False, spans=None,
+                 writer=None):
+    """
+    Builds + writes one day. Returns (date, theme id, manifest entries for
+    the day, written, skipped).
+    """
+    assets = build_assets(cfg, day, spans)
+    written, skipped = write_assets(out_dir, assets, manifest, fingerprint, force, dedup, spans, writer)
+    entries = {}
+    if manifest is not None:
+        d = day.isoformat()
+        entries = {f"{d}/{key}": manifest[f"{d}/{key}"] for key, _, _ in CHANNELS}
+    return day.isoformat(), assets["meta"]["theme"]["id"], entries, written, skipped
+
+# Worker-side state for --jobs: the config is shipped once per process
+# through the pool initializer instead of once per day.
+_WORKER = {}
+
+def _init_worker(cfg, out_dir, manifest, fingerprint, force, dedup, schedule):
+    if schedule is not None:
+        kr3w_engine.use_schedule(schedule)
+    _WORKER.update(cfg=cfg, out_dir=out_dir, manifest=manifest,
+                   fingerprint=fingerprint, force=force, dedup=dedup)
+
+def _generate_shard(days):
+    import kr3w_metrics
+
+    # returns (results, span stats) so the parent can merge the timings
+    w = _WORKER
+    spans = kr3w_metrics.Spans()
+    # one directory sync per shard
+    with kr3w_store.BatchWriter() as writer:
+        results = [generate_day(w["cfg"], w["out_dir"], d, w["manifest"], w["fingerprint"], w["force"],
+                                w["dedup"], spans, writer)
+                   for d in days]
+    return results, spans.stats
+
+def _build_shard(days):
+    import kr3w_metrics
+
+    # shards are contiguous, so the engine can batch-render them
+    spans = kr3w_metrics.Spans()
+    return list(kr3w_engine.render_range(_WORKER["cfg"], days[0], len(days), spans=spans)), spans.stats
+
+def _init_batch_worker(brands):
+    # brands: name -> kr3w_batch.BrandRun.worker_state(); schedules are keyed
+    # by config fingerprint, so every brand's table can be active at once
+    for state in brands.values():
+        if state["schedule"] is not None:
+            kr3w_engine.use_schedule(state["schedule"])
+    _WORKER.update(brands=brands)
+
+def _batch_shard(task):
+    import kr3w_metrics
+
+    # (brand, days) -> (results, span stats, worker seconds). Packed brands
+    # only build here; the parent merges their month files.
+    name, days = task
+    w = _WORKER["brands"][name]
+    spans = kr3w_metrics.Spans()
+    t0 = time.perf_counter()
+    if w["store"] == "packed":
+        results = list(kr3w_engine.render_range(w["cfg"], days[0], len(days), spans=spans))
+    else:
+        with kr3w_store.BatchWriter() as writer:
+            results = [generate_day(w["cfg"], w["out_dir"], d, w["manifest"], w["fingerprint"], w["force"],
+                                    w["dedup"], spans, writer)
+                       for d in days]
+    return results, spans.stats, time.perf_counter() - t0
+
+def shard_days(days, jobs):
+    """
+    Splits the date range into contiguous shards, a few per worker,
+    so results can be concatenated back in date order.
+    """
+    n = max(1, min(len(days), jobs * 4))
+    size = -(-len(days) // n)
+    return [days[i:i + size] for i in range(0, len(days), size)]
+
+def generate_range(cfg, out_dir, days, jobs=1, manifest=None, fingerprint="", force=False, dedup=False,
+                   schedule=None, spans=None):
+    """
+    Builds + writes every day in `days` and yields one generate_day() result
+    per day, always in date order. Each day seeds its own RNG, so output does
+    not depend on how the range is sharded. Worker timings are merged into
+    spans.
+    """
+    if jobs <= 1 or len(days) < 2:
+        # one directory sync for the whole range
+        with kr3w_store.BatchWriter() as writer:
+            for d in days:
+                yield generate_day(cfg, out_dir, d, manifest, fingerprint, force, dedup, spans, writer)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(cfg, out_dir, manifest, fingerprint, force, dedup, schedule)) as pool:
+        # map() hands results back in submission order
+        for results, stats in pool.map(_generate_shard, shard_days(days, jobs)):
+            if spans is not None:
+                spans.merge(stats)
+            yield from results
+
+def build_range(cfg, days, jobs=1, schedule=None, spans=None):
+    """
+    Like generate_range() but only builds: yields assets dicts in date order
+    and leaves writing to the caller (used by the packed store). `days` must
+    be consecutive.
+    """
+    if jobs <= 1 or len(days) < 2:
+        if days:
+            yield from kr3w_engine.render_range(cfg, days[0], len(days), spans=spans)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(cfg, None, None, "", False, False, schedule)) as pool:
+        for results, stats in pool.map(_build_shard, shard_days(days, jobs)):
+            if spans is not None:
+                spans.merge(stats)
+            yield from results
+
+def generate_packed(cfg, out_dir, days, jobs=1, manifest=None, fingerprint="", dedup=False, schedule=None,
+                    spans=None, force=False):
+    """
+    Packed-store counterpart of generate_range(): builds in workers, then
+    merges each month's records in this process (one writer per month file).
+    Yields the same (date, theme id, entries, written, skipped) tuples.
+    """
+    yield from pack_months(out_dir, build_range(cfg, days, jobs, schedule, spans), manifest, fingerprint, dedup,
+                           spans, force)
+
+def pack_months(out_dir, assets_iter, manifest, fingerprint, dedup, spans=None, force=False):
+    """
+    Writes a date-ordered stream of assets dicts to the packed store, one
+    month file at a time, yielding generate_day()-style tuples. With force
+    every touched month file is rewritten and every channel counts as
+    written.
+    """
+    batch = []
+    for assets in assets_iter:
+        batch.append(assets)
+        # flush whenever a month is complete so memory stays bounded
+        if len(batch) > 1 and batch[-1]["meta"]["date"][:7] != batch[-2]["meta"]["date"][:7]:
+            yield from _flush_packed(out_dir, batch[:-1], manifest, fingerprint, dedup, spans, force)
+            batch = batch[-1:]
+    if batch:
+        yield from _flush_packed(out_dir, batch, manifest, fingerprint, dedup, spans, force)
+
+def _flush_packed(out_dir, batch, manifest, fingerprint, dedup, spans=None, force=False):
+    t0 = time.perf_counter()
+    changed = kr3w_store.write_packed(out_dir, batch, dedup, force)
+    if spans is not None:
+        spans.add("write_packed", time.perf_counter() - t0)
+    for assets in batch:
+        d = assets["meta"]["date"]
+        entries = {}
+        if manifest is not None:
+            entries = {f"{d}/{key}": {"hash": content_hash(assets[key]), "config": fingerprint}
+                       for key, _, _ in CHANNELS}
+        written = changed[d]
+        yield d, assets["meta"]["theme"]["id"], entries, written, len(CHANNELS) - written
+
+def regenerate_days(cfg, out_dir, todo, manifest, store="flat", dedup=False):
+    """
+    Rewrites only the listed channels of the listed days (todo is
+    [(day, channel keys)], as kr3w_watch.affected() returns). Packed records
+    hold whole days, so those days are re-rendered in full. Yields the same
+    (date, theme id, entries, written, skipped) tuples as generate_range().
+    """
+    if store == "packed":
+        yield from _flush_packed(out_dir, [build_assets(cfg, d) for d, _ in todo], manifest, cfg.fingerprint, dedup)
+        return
+    with kr3w_store.BatchWriter() as writer:
+        for day, keys in todo:
+            assets = kr3w_engine.render_day(cfg, day, keys)
+            written, skipped = write_assets(out_dir, assets, manifest, cfg.fingerprint, dedup=dedup, writer=writer)
+            d = day.isoformat()
+            entries = {f"{d}/{key}": manifest[f"{d}/{key}"] for key in keys}
+            yield d, assets["meta"]["theme"]["id"], entries, written, skipped
+
+def changed_outputs(out_dir, d, entries, store="flat", dedup=False):
+    """
+    Files a day with rewritten channels may have touched: its flat files or
+    its month file, plus its blobs under dedup.
+    """
+    if store == "packed":
+        paths = [kr3w_store.month_path(out_dir, d)]
+    else:
+        paths = [kr3w_store.flat_path(out_dir, d, key) for key, _, _ in CHANNELS]
+    if dedup:
+        paths.extend(kr3w_store.blob_path(out_dir, e["hash"]) for e in entries.values() if e.get("hash"))
+    return paths
+
+def record_pending(paths):
+    """
+    Appends paths (relative to the repo) to logs/publish.pending, which
+    scripts/publish.py stages and clears after committing. Paths outside
+    the repo (e.g. a batch --out-root elsewhere) are left out.
+    """
+    rel = dict.fromkeys(r for r in (os.path.relpath(p, BASE_DIR) for p in paths) if not r.startswith(os.pardir))
+    if not rel:
+        return
+    with open(PUBLISH_PENDING, "a", encoding="utf-8") as f:
+        f.write("\n".join(rel) + "\n")
+
+def cmd_index(args, out_dir):
+    import kr3w_index
+
+    if args.action == "rebuild":
+        ensure_dirs(out_dir)
+        n = kr3w_index.rebuild(out_dir, CHANNELS, kr3w_store.packed_days(out_dir))
+        print(f"✅ Index rebuilt: {n} day(s) -> {kr3w_index.index_path(out_dir)}")
+    else:
+        latest = kr3w_index.latest_day(out_dir)
+        if latest is None:
+            print("No index yet. Run: python3 kr3w.py index rebuild")
+            return
+        print(f"Latest: {latest}")
+        for d, theme, channels in kr3w_index.days_between(out_dir, args.start or "0000-00-00", args.end or "9999-99-99"):
+            print(f"  {d}  {theme or '?':<10} {len(channels)} file(s)")
+
+def cmd_show(args, out_dir):
+    import kr3w_index
+
+    day = args.date or kr3w_index.latest_day(out_dir) or date.today().isoformat()
+    blocks = kr3w_store.read_day(out_dir, day)
+    if blocks is None:
+        print(f"No output for {day} yet.")
+        return 1
+    for key in args.channel or [key for key, _, _ in CHANNELS]:
+        if len(args.channel or ()) != 1:
+            print(f"--- {key} ({day}) ---")
+        print(blocks[key].rstrip("\n"))
+
+def cmd_unpack(args, out_dir):
+    n = kr3w_store.export_flat(out_dir, args.start, args.end)
+    print(f"✅ Exported {n} packed day(s) to flat files in {out_dir}")
+
+def cmd_stats(args, out_dir):
+    st = kr3w_store.dedup_stats(out_dir, load_manifest(out_dir))
+    print("📦 Dedup stats")
+    print(f"  Entries (date × channel): {st['entries']}")
+    print(f"  Unique contents:          {st['unique']}")
+    print(f"  Dedup ratio:              {st['ratio']:.2f}x")
+    print(f"  Logical bytes:            {st['logical_bytes']}")
+    print(f"  Unique bytes:             {st['unique_bytes']}")
+    print(f"  Blob files:               {st['blob_files']}")
+
+def cmd_dupes(args, out_dir):
+    import kr3w_dupes
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    t0 = time.perf_counter()
+    index = kr3w_dupes.load_index(out_dir)
+    signed = kr3w_dupes.update_index(out_dir, index, jobs)
+    kr3w_dupes.save_index(out_dir, index)
+    clusters = [g for g in index.clusters(args.threshold)
+                if not args.channel or g[0].split("/", 1)[1] == args.channel]
+    elapsed = time.perf_counter() - t0
+
+    print(f"🔎 {len(index.docs)} text(s), {len(index.signatures)} unique, {signed} newly signed ({elapsed:.2f}s)")
+    print(f"   {len(clusters)} near-duplicate cluster(s) at >= {args.threshold:.2f}")
+    for group in clusters[:args.limit]:
+        channel = group[0].split("/", 1)[1]
+        dates = [doc_id.split("/", 1)[0] for doc_id in group]
+        shown = ", ".join(dates[:6]) + (f", … (+{len(dates) - 6})" if len(dates) > 6 else "")
+        print(f"  {channel:<14} {len(group):>4} day(s): {shown}")
+
+def iter_days(start: date, end: date):
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+def cmd_export(args, cfg):
+    import sys
+    import kr3w_export
+
+    start = date.fromisoformat(args.start) if args.start else date.today()
+    end = date.fromisoformat(args.end) if args.end else start + timedelta(days=6)
+    if end < start:
+        raise SystemExit(f"❌ --to ({end}) is before --from ({start})")
+    no_repeat = cfg.no_repeat_days if args.no_repeat is None else args.no_repeat
+    kr3w_engine.use_schedule(kr3w_schedule.load_schedule(cfg, CFG_PATH, start, end, no_repeat))
+
+    # Rendered straight from the config, one day at a time: nothing is read
+    # from or written to output/.
+    channels = args.channel or [key for key, _, _ in CHANNELS]
+    rows = kr3w_export.iter_rows((build_assets(cfg, d) for d in iter_days(start, end)), channels)
+
+    t0 = time.perf_counter()
+    if args.output and args.output != "-":
+        tmp = args.output + ".tmp"
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            n = kr3w_export.export(rows, args.format, f)
+        os.replace(tmp, args.output)
+    else:
+        try:
+            n = kr3w_export.export(rows, args.format, sys.stdout)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # e.g. piped into head; keep the interpreter from complaining at exit
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 0
+    elapsed = time.perf_counter() - t0
+    print(f"📤 Exported {n} row(s), {start.isoformat()}..{end.isoformat()} as {args.format} "
+          f"-> {args.output or 'stdout'} ({elapsed:.2f}s)", file=sys.stderr)
+
+def cmd_watch(args, cfg):
+    import kr3w_index
+    import kr3w_runlog
+    import kr3w_watch
+
+    start = date.fromisoformat(args.start) if args.start else date.today()
+    days = [start + timedelta(days=i) for i in range(args.window)]
+    out_dir = os.path.join(BASE_DIR, "output")
+    log_dir = os.path.join(BASE_DIR, "logs")
+    ensure_dirs(out_dir, log_dir)
+    channel_keys = [key for key, _, _ in CHANNELS]
+
+    def use_schedule_for(c):
+        no_repeat = c.no_repeat_days if args.no_repeat is None else args.no_repeat
+        kr3w_engine.use_schedule(kr3w_schedule.load_schedule(c, CFG_PATH, days[0], days[-1], no_repeat))
+
+    use_schedule_for(cfg)
+    stamp = kr3w_watch.config_stamp(CFG_PATH)
+    print(f"👀 Watching {CFG_PATH} for {days[0].isoformat()}..{days[-1].isoformat()} (Ctrl-C to stop)")
+    try:
+        while True:
+            stamp = kr3w_watch.wait_for_change(CFG_PATH, stamp, args.interval)
+            t0 = time.perf_counter()
+            try:
+                new = kr3w_model.load_config(CFG_PATH)
+            except kr3w_model.ConfigError as e:
+                print(f"❌ Bad config, keeping the previous one: {e}")
+                continue
+            use_schedule_for(new)
+            manifest = load_manifest(out_dir)
+            present = kr3w_watch.existing_days(out_dir, manifest, days)
+            todo = [(day, [key for key in keys if key in present[day.isoformat()]])
+                    for day, keys in kr3w_watch.affected(cfg, new, [d for d in days if d.isoformat() in present],
+                                                         channel_keys)]
+            if new.fingerprint != cfg.fingerprint:
+                kr3w_engine.forget_schedule(cfg.fingerprint)
+            cfg = new
+            if not todo:
+                print("✅ Config changed, no output affected")
+                continue
+
+            store = args.store or cfg.storage
+            dedup = cfg.dedup if args.dedup is None else args.dedup
+            written = 0
+            index_rows = []
+            pending = []
+            with kr3w_runlog.RunLog(log_dir) as log:
+                log.write(f"=== KR3W WATCH {todo[0][0].isoformat()} days={len(todo)} store={store} ===\n")
+                for d, theme_id, entries, w, _ in regenerate_days(cfg, out_dir, todo, manifest, store, dedup):
+                    log.generated(d, theme_id)
+                    manifest.update(entries)
+                    if w:
+                        pending.extend(changed_outputs(out_dir, d, entries, store, dedup))
+                    # the day keeps whatever channels it already had
+                    index_rows.append((d, theme_id, [key for key in channel_keys if key in present[d]], w))
+                    written += w
+                log.write(f"=== DONE written={written} ===\n")
+            save_manifest(out_dir, manifest)
+            kr3w_index.record_days(out_dir, index_rows)
+            record_pending(pending)
+            files = sum(len(keys) for _, keys in todo)
+            print(f"🔁 {len(todo)} day(s), {files} file(s) affected -> {written} written "
+                  f"in {(time.perf_counter() - t0) * 1000:.0f} ms")
+    except KeyboardInterrupt:
+        print("👋 Stopped watching")
+
+def _brand_results(run, shard_results):
+    for results, stats, secs in shard_results:
+        run.spans.merge(stats)
+        run.busy += secs
+        yield from results
+
+def cmd_batch(args):
+    import itertools
+    import kr3w_batch
+    import kr3w_index
+    import kr3w_metrics
+    import kr3w_runlog
+
+    t0 = time.perf_counter()
+    start = parse_start(args.date)
+    if args.days < 1:
+        raise SystemExit("❌ --days must be at least 1")
+    days = [start + timedelta(days=i) for i in range(args.days)]
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    out_root = os.path.abspath(args.out_root or os.path.join(args.brands_dir, "output"))
+    # run log and metrics live with the outputs, so batch runs never mix
+    # into this checkout's logs/ (and `kr3w.py metrics`)
+    log_dir = os.path.join(out_root, "logs")
+    try:
+        runs, errors = kr3w_batch.load_brands(args.brands_dir, out_root, days[0], days[-1], args.no_repeat,
+                                              args.store, args.dedup)
+    except FileNotFoundError:
+        raise SystemExit(f"❌ No such directory: {args.brands_dir}")
+    for name, err in errors:
+        print(f"❌ {name}: bad config: {err}")
+    if not runs:
+        if not errors:
+            print(f"❌ No brand configs in {args.brands_dir} (<name>.json or <name>/{kr3w_batch.CONFIG_NAME})")
+        return 1
+    ensure_dirs(log_dir)
+
+    # Brand-major task order: map() hands results back in submission order,
+    # so each brand's shards arrive together and in date order, while the
+    # pool keeps every worker busy across brand boundaries.
+    shards = shard_days(days, jobs)
+    tasks = [(run.name, shard) for run in runs for shard in shards]
+    brands = {run.name: run.worker_state(args.force) for run in runs}
+    pool = None
+    if jobs > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(max_workers=min(jobs, len(tasks)), initializer=_init_batch_worker,
+                                   initargs=(brands,))
+        shard_results = pool.map(_batch_shard, tasks)
+    else:
+        _init_batch_worker(brands)
+        shard_results = map(_batch_shard, tasks)
+
+    channel_keys = [key for key, _, _ in CHANNELS]
+    try:
+        with kr3w_runlog.RunLog(log_dir) as log:
+            for run in runs:
+                log.write(f"=== KR3W BATCH brand={run.name} {start.isoformat()} days={len(days)} jobs={jobs} "
+                          f"store={run.store} ===\n")
+                results = _brand_results(run, itertools.islice(shard_results, len(shards)))
+                if run.store == "packed":
+                    results = pack_months(run.out_dir, results, run.manifest, run.cfg.fingerprint, run.dedup,
+                                          run.spans, args.force)
+                for d, theme_id, entries, w, sk in results:
+                    log.generated(d, theme_id)
+                    run.manifest.update(entries)
+                    run.index_rows.append((d, theme_id, channel_keys, w))
+                    if w:
+                        run.pending.extend(changed_outputs(run.out_dir, d, entries, run.store, run.dedup))
+                    run.days += 1
+                    run.written += w
+                    run.skipped += sk
+                # month files are merged here rather than in the workers
+                run.busy += run.spans.stats.get("write_packed", (0, 0.0))[1]
+                run.finished = time.perf_counter() - t0
+                log.write(f"=== DONE written={run.written} skipped={run.skipped} ===\n")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    wall = time.perf_counter() - t0
+
+    for run in runs:
+        save_manifest(run.out_dir, run.manifest)
+        kr3w_index.record_days(run.out_dir, run.index_rows)
+        kr3w_metrics.write_run(log_dir, kr3w_metrics.new_run_id() + f"-{run.name}", run.spans, brand=run.name,
+                               start=start.isoformat(), days=run.days, jobs=jobs, store=run.store,
+                               written=run.written, skipped=run.skipped, ms=round(run.finished * 1000, 3))
+        record_pending(run.pending)
+
+    print(f"✅ Batch: {len(runs)} brand(s) x {len(days)} day(s) starting {start.isoformat()} (jobs={jobs})")
+    print(f"  {'brand':<20} {'store':<6} {'days':>6} {'written':>8} {'unchanged':>9} {'worker s':>9} "
+          f"{'days/s':>8} {'done s':>7}")
+    for name, store, n, written, skipped, busy, rate, done in kr3w_batch.summary_rows(runs, wall):
+        print(f"  {name:<20} {store:<6} {n:>6} {written:>8} {skipped:>9} {busy:>9.2f} {rate:>8.1f} {done:>7.2f}")
+    print("  (days/s is per worker second for a brand, per wall second for the total)")
+    print(f"📁 Output: {out_root}/<brand>")
+    print(f"🧾 Log: {log_dir}")
+    return 1 if errors else None
+
+def cmd_links(args, cfg, out_dir):
+    import kr3w_index
+    import kr3w_links
+
+    found = kr3w_links.config_urls(cfg)
+    end = date.fromisoformat(kr3w_index.latest_day(out_dir) or date.today().isoformat())
+    recent = [(end - timedelta(days=i)).isoformat() for i in range(max(0, args.recent))]
+    kr3w_links.output_urls(out_dir, recent, found)
+    for url in args.url or ():
+        found.setdefault(url, []).append("--url")
+
+    t0 = time.perf_counter()
+    ensure_dirs(out_dir)
+    results, counts = kr3w_links.check(out_dir, found, args.ttl, args.concurrency, args.timeout, args.refresh)
+    elapsed = time.perf_counter() - t0
+
+    broken = [url for url in found if not results[url]["ok"]]
+    print(f"🔗 {len(found)} link(s) from the config and {len(recent)} day(s) of output: "
+          f"{len(found) - len(broken)} ok, {len(broken)} broken")
+    print(f"   {counts['checked']} checked, {counts['cached']} cached "
+          f"(ttl {args.ttl:g}h, failures {min(args.ttl, kr3w_links.FAILED_TTL_HOURS):g}h); "
+          f"{counts['requests']} request(s) over {counts['opened']} connection(s) in {elapsed * 1000:.0f} ms")
+    for url in sorted(found, key=lambda u: (results[u]["ok"], u)):
+        r = results[url]
+        where = ", ".join(found[url][:3]) + (f" +{len(found[url]) - 3} more" if len(found[url]) > 3 else "")
+        status = str(r["status"] or "---")
+        detail = r["error"] if not r["ok"] else (f"-> {r['final_url']}" if r["final_url"] != url else "")
+        print(f"{'✅' if r['ok'] else '❌'} {status:>3}  {url}  {detail}".rstrip())
+        if not r["ok"] or args.verbose:
+            print(f"        used by: {where}")
+    return 1 if broken else None
+
+def cmd_log(args, log_dir):
+    import kr3w_runlog
+
+    if args.reindex:
+        n = kr3w_runlog.rebuild_index(log_dir)
+        print(f"✅ Run log re-indexed: {n} generated day(s)")
+    if args.rotate:
+        name = kr3w_runlog.maybe_rotate(log_dir, force=True)
+        print(f"✅ Rotated to {name}" if name else "Nothing to rotate")
+    if args.date:
+        hits = kr3w_runlog.query(log_dir, args.date)
+        if not hits:
+            print(f"No run logged {args.date}.")
+            return 1
+        for segment, header, line in hits:
+            print(f"{line}    [{segment}] {header}")
+
+def cmd_metrics(args, log_dir):
+    import kr3w_metrics
+
+    runs = kr3w_metrics.load_runs(log_dir, args.runs)
+    if not runs:
+        print(f"No metrics yet ({kr3w_metrics.metrics_path(log_dir)}). Run: python3 kr3w.py")
+        return
+    totals = [stages["run"]["ms"] for stages in runs.values() if "ms" in stages.get("run", {})]
+    print(f"⏱  Last {len(runs)} run(s): total p50 {kr3w_metrics.percentile(totals, 0.5):.1f} ms, "
+          f"p95 {kr3w_metrics.percentile(totals, 0.95):.1f} ms")
+    print(f"  {'stage':<28} {'runs':>4} {'p50 ms':>10} {'p95 ms':>10} {'per op':>10} {'bytes/run':>10}")
+    for stage, n, p50, p95, per_op, nbytes in kr3w_metrics.summarize(runs):
+        per_op_s = f"{per_op * 1000:.1f} µs"
+        print(f"  {stage:<28} {n:>4} {p50:>10.2f} {p95:>10.2f} {per_op_s:>10} {nbytes:>10.0f}")
+
+def cmd_schedule(args, cfg):
+    start = date.fromisoformat(args.start) if args.start else date.today()
+    end = date.fromisoformat(args.end) if args.end else start + timedelta(days=6)
+    no_repeat = cfg.no_repeat_days if args.no_repeat is None else args.no_repeat
+    sched = kr3w_schedule.load_schedule(cfg, CFG_PATH, start, end, no_repeat)
+    for day, theme_id in sched.days(start, end):
+        theme = cfg.themes_by_id[theme_id]
+        print(f"{day.isoformat()}  {day.strftime('%a').lower()}  {theme_id:<10} {cfg.links.get(theme.primary_link)}")
+
+def parse_start(value):
+    if not value:
+        return date.today()
+    # fromisoformat avoids pulling in the _strptime machinery
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise SystemExit(f"❌ --date must be YYYY-MM-DD, got {value!r}")
+
 def parse_args():
+    import argparse
+
     p = argparse.ArgumentParser()
     p.add_argument("--date", help="YYYY-MM-DD (default: today)")
     p.add_argument("--days", type=int, default=1, help="Generate N days starting at --date (or today)")
+    p.add_argument("--jobs", type=int, default=1, help="Worker processes for multi-day runs (0 = all cores)")
+    p.add_argument("--force", action="store_true", help="Rewrite files even if the manifest says they are unchanged")
+    p.add_argument("--timings", action="store_true", help="Print per-stage startup/run timings")
+    p.add_argument("--store", choices=kr3w_model.STORAGE_BACKENDS,
+                   help="Output layout (default: 'storage' from config, else flat)")
+    p.add_argument("--no-repeat", type=int, metavar="N",
+                   help="No identical theme/hook/CTA combo within N days (default: 'no_repeat_days' from config)")
+    p.add_argument("--dedup", action="store_true", default=None,
+                   help="Store each unique text once under output/blobs/ (default: 'dedup' from config)")
+    sub = p.add_subparsers(dest="command")
+    ix = sub.add_parser("index", help="Inspect or rebuild output/.index.sqlite")
+    ix.add_argument("action", choices=["show", "rebuild"])
+    ix.add_argument("--from", dest="start", help="show: first date (YYYY-MM-DD)")
+    ix.add_argument("--to", dest="end", help="show: last date (YYYY-MM-DD)")
+    sh = sub.add_parser("show", help="Print one day's assets from either output layout")
+    sh.add_argument("--date", help="YYYY-MM-DD (default: latest generated day)")
+    sh.add_argument("--channel", action="append", choices=[key for key, _, _ in CHANNELS],
+                    help="Only this channel (repeatable)")
+    up = sub.add_parser("unpack", help="Write legacy flat files from the packed store")
+    up.add_argument("--from", dest="start", help="First date (YYYY-MM-DD)")
+    up.add_argument("--to", dest="end", help="Last date (YYYY-MM-DD)")
+    sub.add_parser("stats", help="Report how much generated content is shared across days")
+    du = sub.add_parser("dupes", help="Report near-duplicate texts across the output archive")
+    du.add_argument("--threshold", type=float, default=0.8, help="Estimated Jaccard similarity (default 0.8)")
+    du.add_argument("--channel", choices=[key for key, _, _ in CHANNELS], help="Only this channel")
+    du.add_argument("--limit", type=int, default=20, help="Clusters to print (default 20)")
+    du.add_argument("--jobs", type=int, default=0, help="Worker processes for signing (0 = all cores)")
+    ex = sub.add_parser("export", help="Stream a date range as one row per (date, channel) for schedulers")
+    ex.add_argument("--from", dest="start", help="First date (default: today)")
+    ex.add_argument("--to", dest="end", help="Last date (default: --from + 6 days)")
+    ex.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="Row format (default jsonl)")
+    ex.add_argument("--channel", action="append", choices=[key for key, _, _ in CHANNELS],
+                    help="Only this channel (repeatable)")
+    ex.add_argument("-o", "--output", help="Write to this file instead of stdout")
+    wa = sub.add_parser("watch", help="Regenerate only what a kr3w_config.json edit changes")
+    wa.add_argument("--from", dest="start", help="First date of the window (default: today)")
+    wa.add_argument("--days", dest="window", type=int, default=365,
+                    help="Window length in days (default 365); only days already generated are rewritten")
+    wa.add_argument("--interval", type=float, default=0.2, help="Seconds between config polls (default 0.2)")
+    lg = sub.add_parser("log", help="Query or rotate logs/run.log")
+    lg.add_argument("--date", help="Which runs generated this day (YYYY-MM-DD)")
+    lg.add_argument("--rotate", action="store_true", help="Gzip the live segment now")
+    lg.add_argument("--reindex", action="store_true", help="Rebuild logs/.runlog.sqlite from every segment")
+    me = sub.add_parser("metrics", help="p50/p95 per stage over recent runs (logs/metrics.jsonl)")
+    me.add_argument("--runs", type=int, default=20, help="How many recent runs (default 20)")
+    ba = sub.add_parser("batch", help="Generate every brand config in a directory on one shared worker pool")
+    ba.add_argument("brands_dir", help="Directory of <brand>.json or <brand>/kr3w_config.json configs")
+    ba.add_argument("--out-root",
+                    help="Each brand writes to <out-root>/<brand>, the run log and metrics to <out-root>/logs "
+                         "(default: <brands_dir>/output)")
+    li = sub.add_parser("links", help="Check every URL in the config and recent outputs")
+    li.add_argument("action", choices=["check"])
+    li.add_argument("--days", dest="recent", type=int, default=7,
+                    help="Also scan this many days of output, ending at the latest (default 7)")
+    li.add_argument("--url", action="append", help="Extra URL to check (repeatable)")
+    li.add_argument("--ttl", type=float, default=24.0,
+                    help="Hours a cached result stays fresh (default 24; failures at most 1)")
+    li.add_argument("--refresh", action="store_true", help="Ignore the cache and re-check everything")
+    li.add_argument("--concurrency", type=int, default=16, help="Checks in flight at once (default 16)")
+    li.add_argument("--timeout", type=float, default=10.0, help="Seconds per request (default 10)")
+    li.add_argument("-v", "--verbose", action="store_true", help="Also list where working links are used")
+    sc = sub.add_parser("schedule", help="Print which theme runs on each date")
+    sc.add_argument("--from", dest="start", help="First date (default: today)")
+    sc.add_argument("--to", dest="end", help="Last date (default: --from + 6 days)")
     return p.parse_args()
 
 def main():
+    timings = Timings()
     args = parse_args()
-    cfg = load_config()
-
-    start = date.today()
-    if args.date:
-        start = datetime.strptime(args.date, "%Y-%m-%d").date()
+    timings.enabled = args.timings
+    timings.mark("parse args")
 
     out_dir = os.path.join(BASE_DIR, "output")
+    if args.command == "index":
+        return cmd_index(args, out_dir)
+    if args.command == "show":
+        return cmd_show(args, out_dir)
+    if args.command == "unpack":
+        return cmd_unpack(args, out_dir)
+    if args.command == "stats":
+        return cmd_stats(args, out_dir)
+    if args.command == "dupes":
+        return cmd_dupes(args, out_dir)
     log_dir = os.path.join(BASE_DIR, "logs")
-    ensure_dirs(out_dir, log_dir)
+    if args.command == "metrics":
+        return cmd_metrics(args, log_dir)
+    if args.command == "log":
+        ensure_dirs(log_dir)
+        return cmd_log(args, log_dir)
+    if args.command == "batch":
+        return cmd_batch(args)
+
+    import kr3w_metrics
+
+    spans = kr3w_metrics.Spans()
+    t0 = time.perf_counter()
+    try:
+        cfg, from_snapshot = kr3w_model.load_config_cached(CFG_PATH)
+    except kr3w_model.ConfigError as e:
+        raise SystemExit(f"❌ Bad config: {e}")
+    spans.add("load_config" if from_snapshot else "load_config.cold", time.perf_counter() - t0)
+    timings.mark("config (warm)" if from_snapshot else "config (cold)")
+
+    if args.command == "schedule":
+        return cmd_schedule(args, cfg)
+    if args.command == "export":
+        return cmd_export(args, cfg)
+    if args.command == "watch":
+        return cmd_watch(args, cfg)
+    if args.command == "links":
+        return cmd_links(args, cfg, out_dir)
+    import kr3w_index
+    import kr3w_runlog
+
+    start = parse_start(args.date)
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
 
-    log_path = os.path.join(log_dir, "run.log")
-    with open(log_path, "a", encoding="utf-8") as log:
-        log.write(f"=== KR3W RUN {start.isoformat()} days={args.days} ===\n")
-
-        for i in range(args.days):
-            day = start + timedelta(days=i)
-            assets = build_assets(cfg, day)
-            write_assets(out_dir, assets)
-            log.write(f"Generated: {day.isoformat()} theme={assets['meta']['theme'].get('id','')}\n")
+    ensure_dirs(out_dir, log_dir)
 
-        log.write("=== DONE ===\n")
+    days = [start + timedelta(days=i) for i in range(args.days)]
+    schedule = None
+    if days:
+        no_repeat = cfg.no_repeat_days if args.no_repeat is None else args.no_repeat
+        schedule = kr3w_schedule.load_schedule(cfg, CFG_PATH, days[0], days[-1], no_repeat)
+        kr3w_engine.use_schedule(schedule)
+    timings.mark("schedule")
+
+    log_path = kr3w_runlog.log_path(log_dir)
+    manifest = load_manifest(out_dir)
+    fingerprint = cfg.fingerprint
+    written = skipped = 0
+    index_rows = []
+    pending = []
+    timings.mark("load manifest")
+
+    t0 = time.perf_counter()
+    with kr3w_runlog.RunLog(log_dir) as log:
+        store = args.store or cfg.storage
+        log.write(f"=== KR3W RUN {start.isoformat()} days={args.days} jobs={jobs} store={store} ===\n")
+
+        channel_keys = [key for key, _, _ in CHANNELS]
+        dedup = cfg.dedup if args.dedup is None else args.dedup
+        if store == "packed":
+            results = generate_packed(cfg, out_dir, days, jobs, manifest, fingerprint, dedup, schedule, spans,
+                                      args.force)
+        else:
+            results = generate_range(cfg, out_dir, days, jobs, manifest, fingerprint, args.force, dedup,
+                                     schedule, spans)
+        for d, theme_id, entries, w, sk in results:
+            log.generated(d, theme_id)
+            manifest.update(entries)
+            index_rows.append((d, theme_id, channel_keys, w))
+            if w:
+                pending.extend(changed_outputs(out_dir, d, entries, store, dedup))
+            written += w
+            skipped += sk
+
+        log.write(f"=== DONE written={written} skipped={skipped} ===\n")
+    elapsed = time.perf_counter() - t0
+    timings.mark("generate")
+    save_manifest(out_dir, manifest)
+    timings.mark("save manifest")
+    kr3w_index.record_days(out_dir, index_rows)
+    record_pending(pending)
+    timings.mark("update index")
+    kr3w_metrics.write_run(log_dir, kr3w_metrics.new_run_id(), spans, start=start.isoformat(), days=args.days,
+                           jobs=jobs, store=store, written=written, skipped=skipped,
+                           ms=round((time.perf_counter() - _T0) * 1000, 3))
 
     print(f"✅ Generated {args.days} day(s) starting {start.isoformat()}")
+    print(f"📝 Files: {written} written, {skipped} unchanged")
+    print(f"⚡ {args.days / elapsed if elapsed > 0 else 0:.1f} days/sec ({elapsed:.2f}s, jobs={jobs})")
     print(f"📁 Output: {out_dir}")
     print(f"🧾 Log: {log_path}")
+    timings.report()
 
 if __name__ == "__main__":
-    main()
+    import sys
+
+    try:
+        code = main()
+        # flush here so a reader that went away (kr3w.py metrics | head) is caught below
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # like any CLI filter: stop quietly instead of printing a traceback
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        code = 1
+    raise SystemExit(code)
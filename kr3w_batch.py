@@ -0,0 +1,95 @@
+import os
+import time
+
+import kr3w_metrics
+import kr3w_model
+import kr3w_schedule
+from kr3w_store import load_manifest
+
+# A brand is either <brands dir>/<name>.json or <brands dir>/<name>/kr3w_config.json
+CONFIG_NAME = "kr3w_config.json"
+
+
+def discover(brands_dir):
+    """
+    [(brand name, config path)] for every brand config under brands_dir,
+    sorted by name.
+    """
+    found = {}
+    for entry in sorted(os.listdir(brands_dir)):
+        path = os.path.join(brands_dir, entry)
+        if entry.endswith(".json") and os.path.isfile(path):
+            found.setdefault(entry[:-len(".json")], path)
+        elif os.path.isfile(os.path.join(path, CONFIG_NAME)):
+            found.setdefault(entry, os.path.join(path, CONFIG_NAME))
+    return sorted(found.items())
+
+
+class BrandRun:
+    """
+    One brand's share of a batch: its compiled config, schedule, isolated
+    output dir and manifest, plus the counters for the summary.
+    """
+    def __init__(self, name, cfg_path, out_dir, cfg, schedule, store, dedup):
+        self.name = name
+        self.cfg_path = cfg_path
+        self.out_dir = out_dir
+        self.cfg = cfg
+        self.schedule = schedule
+        self.store = store
+        self.dedup = dedup
+        self.manifest = load_manifest(out_dir)
+        self.spans = kr3w_metrics.Spans()
+        self.index_rows = []
+        self.pending = []
+        self.days = self.written = self.skipped = 0
+        # summed worker time for this brand's shards, and when its last one landed
+        self.busy = 0.0
+        self.finished = 0.0
+
+    def worker_state(self, force):
+        # what each pool process needs to generate this brand's shards
+        return dict(cfg=self.cfg, out_dir=self.out_dir, manifest=self.manifest,
+                    fingerprint=self.cfg.fingerprint, force=force, dedup=self.dedup, store=self.store,
+                    schedule=self.schedule)
+
+
+def load_brands(brands_dir, out_root, start, end, no_repeat=None, store=None, dedup=None):
+    """
+    Compiles each brand config once (through the snapshot cache) and its
+    schedule for start..end. Returns ([BrandRun], [(name, error)]); a bad
+    config is reported without stopping the other brands.
+    """
+    runs, errors = [], []
+    for name, cfg_path in discover(brands_dir):
+        t0 = time.perf_counter()
+        try:
+            cfg, from_snapshot = kr3w_model.load_config_cached(cfg_path)
+        except kr3w_model.ConfigError as e:
+            errors.append((name, str(e)))
+            continue
+        secs = time.perf_counter() - t0
+        window = cfg.no_repeat_days if no_repeat is None else no_repeat
+        schedule = kr3w_schedule.load_schedule(cfg, cfg_path, start, end, window)
+        out_dir = os.path.join(out_root, name)
+        os.makedirs(out_dir, exist_ok=True)
+        run = BrandRun(name, cfg_path, out_dir, cfg, schedule, store or cfg.storage,
+                       cfg.dedup if dedup is None else dedup)
+        run.spans.add("load_config" if from_snapshot else "load_config.cold", secs)
+        runs.append(run)
+    return runs, errors
+
+
+def summary_rows(runs, wall):
+    """
+    [(brand, store, days, written, unchanged, worker s, days per worker s,
+    finished at s)] plus a totals row whose rate is days per wall second.
+    """
+    rows = []
+    for r in runs:
+        rows.append((r.name, r.store, r.days, r.written, r.skipped, r.busy,
+                     r.days / r.busy if r.busy > 0 else 0.0, r.finished))
+    days = sum(r.days for r in runs)
+    rows.append(("total", "", days, sum(r.written for r in runs), sum(r.skipped for r in runs),
+                 sum(r.busy for r in runs), days / wall if wall > 0 else 0.0, wall))
+    return rows
@@ -0,0 +1,228 @@
+import os
+import pickle
+import re
+import zlib
+
+import kr3w_store
+
+# output/.dupes.pickle — signatures by content hash + LSH buckets
+DUPES_NAME = ".dupes.pickle"
+DUPES_VERSION = 1
+
+SHINGLE_WORDS = 3
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+_PRIME = (1 << 61) - 1
+_MASK = (1 << 32) - 1
+
+
+def _perms():
+    # Fixed (a, b) pairs so signatures are stable across runs and machines
+    out = []
+    x = 0x9E3779B97F4A7C15
+    for _ in range(NUM_PERM):
+        x = (x * 6364136223846793005 + 1442695040888963407) & ((1 << 64) - 1)
+        a = (x >> 3) % (_PRIME - 1) + 1
+        x = (x * 6364136223846793005 + 1442695040888963407) & ((1 << 64) - 1)
+        b = (x >> 3) % _PRIME
+        out.append((a, b))
+    return tuple(out)
+
+
+PERMS = _perms()
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def shingles(text):
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))}
+    return {
+        zlib.crc32(" ".join(words[i:i + SHINGLE_WORDS]).encode("utf-8"))
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    }
+
+
+def signature(text):
+    sh = shingles(text)
+    return tuple(min(((a * x + b) % _PRIME) & _MASK for x in sh) for a, b in PERMS)
+
+
+def _signature_batch(items):
+    return [(h, signature(text)) for h, text in items]
+
+
+def similarity(sig_a, sig_b):
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def band_keys(sig):
+    return [(band, hash(sig[band * ROWS:(band + 1) * ROWS])) for band in range(BANDS)]
+
+
+class DupeIndex:
+    """
+    docs:       "<date>/<channel>" -> content hash
+    signatures: content hash -> MinHash signature (computed once per text)
+    buckets:    (channel, band, band hash) -> set of content hashes
+    Only content hashes not seen before are signed and bucketed, so an update
+    after a daily run costs O(new texts), not O(archive).
+    """
+    __slots__ = ("docs", "signatures", "buckets")
+
+    def __init__(self):
+        self.docs = {}
+        self.signatures = {}
+        self.buckets = {}
+
+    def add(self, doc_id, h, sig):
+        channel = doc_id.split("/", 1)[1]
+        self.docs[doc_id] = h
+        if h not in self.signatures:
+            self.signatures[h] = sig
+        for band, bh in band_keys(self.signatures[h]):
+            self.buckets.setdefault((channel, band, bh), set()).add(h)
+
+    def clusters(self, threshold):
+        """
+        Groups of doc ids whose texts are estimated >= threshold similar,
+        found by union-find over LSH candidate pairs. Largest first.
+        """
+        parent = {}
+        live = set(self.docs.values())
+
+        def find(x):
+            parent.setdefault(x, x)
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for members in self.buckets.values():
+            # texts that were since rewritten must not bridge clusters
+            ms = sorted(m for m in members if m in live)
+            if len(ms) < 2:
+                continue
+            for i, a in enumerate(ms):
+                for b in ms[i + 1:]:
+                    ra, rb = find(a), find(b)
+                    if ra != rb and similarity(self.signatures[a], self.signatures[b]) >= threshold:
+                        parent[rb] = ra
+
+        # exact duplicates share a content hash, so group docs by hash first
+        by_root = {}
+        for doc_id, h in self.docs.items():
+            channel = doc_id.split("/", 1)[1]
+            by_root.setdefault((channel, find(h)), []).append(doc_id)
+        groups = [sorted(g) for g in by_root.values() if len(g) > 1]
+        groups.sort(key=lambda g: (-len(g), g[0]))
+        return groups
+
+
+def dupes_path(out_dir):
+    return os.path.join(out_dir, DUPES_NAME)
+
+
+def load_index(out_dir):
+    try:
+        with open(dupes_path(out_dir), "rb") as f:
+            version, index = pickle.load(f)
+        if version == DUPES_VERSION:
+            return index
+    except Exception:
+        pass
+    return DupeIndex()
+
+
+def save_index(out_dir, index):
+    path = dupes_path(out_dir)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump((DUPES_VERSION, index), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def iter_documents(out_dir, manifest):
+    """
+    Yields (doc_id, content hash, text or None) for every channel text in
+    out_dir. Text is None when the manifest already vouches for the hash
+    and the file's size and mtime still match what it recorded, so
+    unchanged days are never read.
+    """
+    seen = set()
+    for fn in os.listdir(out_dir):
+        for key, prefix, suffix in kr3w_store.CHANNELS:
+            if fn.startswith(prefix) and fn.endswith(suffix):
+                d = fn[len(prefix):-len(suffix)]
+                if len(d) != 10 or d[4] != "-" or d[7] != "-":
+                    continue
+                doc_id = f"{d}/{key}"
+                seen.add(doc_id)
+                path = os.path.join(out_dir, fn)
+                entry = manifest.get(doc_id)
+                if entry and entry.get("hash") and _stamp_matches(path, entry):
+                    yield doc_id, entry["hash"], None
+                else:
+                    with open(path, "r", encoding="utf-8") as f:
+                        text = f.read()
+                    yield doc_id, kr3w_store.content_hash(text), text
+    for rec in kr3w_store.iter_packed(out_dir):
+        for key, text in kr3w_store.record_channels(out_dir, rec).items():
+            doc_id = f"{rec['date']}/{key}"
+            if doc_id not in seen:
+                yield doc_id, kr3w_store.content_hash(text), text
+
+
+def _stamp_matches(path, entry):
+    # entries from before size/mtime_ns were recorded never match
+    if "size" not in entry:
+        return False
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return False
+    return st.st_size == entry["size"] and st.st_mtime_ns == entry.get("mtime_ns")
+
+
+def update_index(out_dir, index, jobs=1):
+    """
+    Brings the index in line with out_dir. Returns the number of new texts
+    that had to be signed.
+    """
+    manifest = kr3w_store.load_manifest(out_dir)
+    current = {}
+    todo = {}
+    for doc_id, h, text in iter_documents(out_dir, manifest):
+        if h not in index.signatures and h not in todo and text is None:
+            # sign what is actually on disk, keyed by the hash of those bytes
+            d, key = doc_id.split("/", 1)
+            with open(kr3w_store.flat_path(out_dir, d, key), "r", encoding="utf-8") as f:
+                text = f.read()
+            h = kr3w_store.content_hash(text)
+        current[doc_id] = h
+        if h not in index.signatures and h not in todo:
+            todo[h] = text
+
+    # signing is the only CPU-heavy step; spread big batches across cores
+    items = list(todo.items())
+    if jobs > 1 and len(items) > 200:
+        from concurrent.futures import ProcessPoolExecutor
+
+        size = -(-len(items) // (jobs * 4))
+        batches = [items[i:i + size] for i in range(0, len(items), size)]
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            signed = [pair for batch in pool.map(_signature_batch, batches) for pair in batch]
+    else:
+        signed = _signature_batch(items)
+    sigs = dict(signed)
+
+    # drop docs that disappeared or changed, then (re)add
+    stale = [doc_id for doc_id, h in index.docs.items() if current.get(doc_id) != h]
+    for doc_id in stale:
+        del index.docs[doc_id]
+    for doc_id, h in current.items():
+        if index.docs.get(doc_id) != h:
+            index.add(doc_id, h, sigs.get(h) or index.signatures[h])
+    return len(sigs)
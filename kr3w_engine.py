@@ -0,0 +1,285 @@
+import random
+from datetime import date, timedelta
+from time import perf_counter
+
+import kr3w_schedule
+
+# Channel key -> renderer(cfg, draw) -> text. Register new channels with @renderer("key").
+RENDERERS = {}
+
+# What kr3w.py writes for every day (blog_long is opt-in, see build_blog_post.py)
+DEFAULT_CHANNELS = ("blog", "ad_facebook", "ad_tiktok", "caption_short", "sms_cta", "youtube")
+
+
+def renderer(key):
+    def register(fn):
+        RENDERERS[key] = fn
+        return fn
+    return register
+
+
+# Compiled rotation tables by config fingerprint (see use_schedule)
+_SCHEDULES = {}
+
+
+def use_schedule(schedule):
+    """
+    Makes draw_day() look themes up in this compiled Schedule instead of
+    applying the rotation rule day by day.
+    """
+    _SCHEDULES[schedule.fingerprint] = schedule
+
+
+def forget_schedule(fingerprint):
+    _SCHEDULES.pop(fingerprint, None)
+
+
+def scheduled_picks(cfg, day: date):
+    sched = _SCHEDULES.get(cfg.fingerprint)
+    return sched.picks(day) if sched is not None else None
+
+
+def scheduled_theme_id(cfg, day: date):
+    sched = _SCHEDULES.get(cfg.fingerprint)
+    if sched is not None:
+        try:
+            return sched.theme_id(day)
+        except KeyError:
+            pass
+    return kr3w_schedule.theme_id_for(cfg, day)
+
+
+def pick(rng, items, fallback=""):
+    if not items:
+        return fallback
+    return rng.choice(items)
+
+
+class Draw:
+    """
+    Everything that varies per day, drawn once and shared by every channel:
+    theme (from the rotation schedule), hook, CTA and primary link. `rng()`
+    hands renderers that need more variation their own generator,
+    continuing from the same seeded stream, so channel order never changes
+    what another channel gets.
+    """
+    __slots__ = ("date", "theme", "hook", "cta", "primary_link", "primary_url", "_state")
+
+    def rng(self):
+        r = random.Random()
+        r.setstate(self._state)
+        return r
+
+
+def draw_day(cfg, day: date, theme_id=None):
+    # deterministic per-day output
+    rng = random.Random(day.isoformat())
+
+    d = Draw()
+    d.date = day
+    if not (theme_id and theme_id in cfg.themes_by_id):
+        theme_id = scheduled_theme_id(cfg, day)
+    d.theme = cfg.themes_by_id[theme_id]
+    # per-theme pools first, top-level pools as the fallback
+    hooks = d.theme.hooks or cfg.hooks
+    ctas = d.theme.ctas or cfg.ctas
+    d.hook = pick(rng, hooks)
+    d.cta = pick(rng, ctas)
+    # No-repeat mode: the schedule planned this day's hook/CTA (same rng
+    # draws above, so blog_long's extra variation is unaffected)
+    planned = scheduled_picks(cfg, day) if theme_id == scheduled_theme_id(cfg, day) else None
+    if planned and hooks and ctas:
+        d.hook, d.cta = hooks[planned[0]], ctas[planned[1]]
+    d.primary_link = d.theme.primary_link
+    d.primary_url = cfg.links.get(d.primary_link)
+    d._state = rng.getstate()
+    return d
+
+
+def _assemble(cfg, d, fns, spans=None):
+    if spans is None:
+        assets = {key: fn(cfg, d) for key, fn in fns}
+    else:
+        # one "build_assets.<channel>" span per renderer call
+        assets = {}
+        for key, fn in fns:
+            t0 = perf_counter()
+            assets[key] = fn(cfg, d)
+            spans.add("build_assets." + key, perf_counter() - t0)
+    assets["meta"] = {
+        "date": d.date.isoformat(),
+        "theme": d.theme.as_dict(),
+        "primary_link": d.primary_link,
+        "primary_url": d.primary_url,
+    }
+    return assets
+
+
+def render_day(cfg, day: date, channels=DEFAULT_CHANNELS, theme_id=None, spans=None):
+    """
+    One day's assets in the shape kr3w.py has always used:
+    {channel: text, ..., "meta": {...}}. With spans (a kr3w_metrics.Spans),
+    each channel's render time is recorded.
+    """
+    return _assemble(cfg, draw_day(cfg, day, theme_id), [(key, RENDERERS[key]) for key in channels], spans)
+
+
+def render_range(cfg, start: date, days: int, channels=DEFAULT_CHANNELS, spans=None):
+    """
+    Yields render_day() for `days` consecutive days starting at `start`.
+    Channel renderers are looked up once for the whole batch.
+    """
+    fns = [(key, RENDERERS[key]) for key in channels]
+    for i in range(days):
+        yield _assemble(cfg, draw_day(cfg, start + timedelta(days=i)), fns, spans)
+
+
+# --- Channel renderers ---
+
+@renderer("blog")
+def render_blog(cfg, d):
+    blog = []
+    blog.append(f"# {d.hook}\n")
+    blog.append("In today’s world, creators need one simple place where everything connects.\n")
+    blog.append("That’s why I use a central hub that keeps all my content, products, and updates together.\n")
+    blog.append(f"Whether you’re here for **{d.theme.label}**, it all starts in one place.\n")
+    blog.append(f"👉 {d.primary_url}\n")
+    blog.append("## Why this matters\n")
+    blog.append("People don’t want clutter. They want clarity.\n")
+    blog.append("One link. One destination. Everything connected.\n")
+    blog.append("## Final Thoughts\n")
+    blog.append("If you support independent creators and real hustle, bookmark the hub and stay tuned.\n")
+    return "\n".join(blog).strip() + "\n"
+
+
+@renderer("ad_facebook")
+def render_facebook(cfg, d):
+    return (
+        f"{cfg.brand.name}: {cfg.brand.tagline}\n\n"
+        f"{d.hook}\n"
+        f"One hub for merch, wellness, and updates.\n\n"
+        f"{d.cta}\n{d.primary_url}\n\n"
+        f"{cfg.tag_str}\n"
+    )
+
+
+@renderer("ad_tiktok")
+def render_tiktok(cfg, d):
+    return (
+        f"{d.hook}\n"
+        f"{d.cta} {d.primary_url}\n"
+        f"{cfg.tag_str}\n"
+    )
+
+
+@renderer("caption_short")
+def render_caption(cfg, d):
+    return (
+        f"{d.hook}\n"
+        f"{d.primary_url}\n"
+        f"{cfg.tag_str}\n"
+    )
+
+
+@renderer("youtube")
+def render_youtube(cfg, d):
+    return (
+        f"{d.hook}\n\n"
+        f"{d.cta}\n"
+        f"{d.primary_url}\n\n"
+        f"{cfg.tag_str}\n"
+    )
+
+
+@renderer("sms_cta")
+def render_sms(cfg, d):
+    # opt-in style
+    return (
+        f"{cfg.brand.name}: {cfg.brand.tagline}\n"
+        f"Want the hub link + updates? Reply '{cfg.brand.sms_keyword}' and I’ll send it.\n"
+        f"{d.primary_url}\n"
+    )
+
+
+# Pinned linktree for the long-form post so the link never drifts
+BLOG_LONG_LINK = "https://linktr.ee/k1ngj0k"
+
+BLOG_INTROS = (
+    "In today’s world, creators need one simple place where everything connects.",
+    "Creators don’t need 15 links. They need one clean hub.",
+    "If you’ve ever had to hunt down a creator’s links… you get why a hub matters.",
+    "Everything is scattered online. A hub fixes that.",
+)
+BLOG_BRIDGES = (
+    "That’s why I run everything through one place — content, drops, updates, all of it.",
+    "So I keep it simple: one place that connects the whole ecosystem.",
+    "That’s why I centralize it — less friction, more focus.",
+    "One hub keeps the noise down and the momentum up.",
+)
+BLOG_WHYS = (
+    "People don’t want clutter. They want clarity.",
+    "If it’s hard to find, it’s easy to ignore. A hub removes friction.",
+    "The easier it is to follow, the more likely people actually stick around.",
+    "A clean path beats a complicated maze — every time.",
+)
+BLOG_FINALS = (
+    "If you support independent creators and real hustle, bookmark the hub and stay tuned.",
+    "If you’ve been here rocking with us, you already know — this is just the beginning.",
+    "This is the build. If you feel it, you’re part of it.",
+    "No fluff. Just progress. Stay locked in.",
+)
+BLOG_WHAT_NEXT = (
+    "Browse the latest",
+    "Check what’s new",
+    "Follow the hub",
+    "Bookmark this",
+    "If you want to support, start here",
+    "New drops + updates live here",
+)
+
+
+@renderer("blog_long")
+def render_blog_long(cfg, d, generated_at=None):
+    """
+    Medium/Substack-ready markdown post with rotating intro/bridge/why/final
+    sections (what scripts/build_blog_post.py saves).
+    """
+    rng = d.rng()
+    intro = pick(rng, BLOG_INTROS)
+    bridge = pick(rng, BLOG_BRIDGES)
+    why = pick(rng, BLOG_WHYS)
+    final = pick(rng, BLOG_FINALS)
+    what_next = f"- {d.cta}\n- {pick(rng, BLOG_WHAT_NEXT)}: {BLOG_LONG_LINK}"
+
+    date_str = d.date.isoformat()
+    generated_str = generated_at or date_str
+    label = d.theme.label
+    tag_line = " ".join(cfg.hashtags)
+
+    return f"""# One Link. One Hub. Everything Connected.
+
+**Pillar:** {label}  
+**Date:** {date_str}  
+**Brand:** {cfg.brand.name}  
+**Generated:** {generated_str}
+
+{intro}
+
+{bridge}
+
+Whether you’re here for **{label}**, it all starts in one place.
+
+👉 {BLOG_LONG_LINK}
+
+## Why this matters
+{why}
+
+## What to do next
+{what_next}
+
+## Final Thoughts
+{final}
+
+---
+{tag_line}
+"""
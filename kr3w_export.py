@@ -0,0 +1,54 @@
+import csv
+import json
+
+# One row per (date, channel), in this column order
+EXPORT_FIELDS = ("date", "channel", "theme", "theme_label", "primary_link", "primary_url", "text")
+
+
+def iter_rows(assets_iter, channels):
+    """
+    Flattens a stream of build_assets() dicts into export rows. Pulls one
+    day at a time, so memory does not grow with the range.
+    """
+    for assets in assets_iter:
+        meta = assets["meta"]
+        theme = meta["theme"]
+        for key in channels:
+            yield {
+                "date": meta["date"],
+                "channel": key,
+                "theme": theme["id"],
+                "theme_label": theme["label"],
+                "primary_link": meta["primary_link"],
+                "primary_url": meta["primary_url"],
+                "text": assets[key],
+            }
+
+
+def write_jsonl(rows, f):
+    n = 0
+    for row in rows:
+        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        n += 1
+    return n
+
+
+def write_csv(rows, f):
+    # f must be opened with newline="" (csv writes its own \r\n)
+    w = csv.DictWriter(f, fieldnames=EXPORT_FIELDS)
+    w.writeheader()
+    n = 0
+    for row in rows:
+        w.writerow(row)
+        n += 1
+    return n
+
+
+WRITERS = {"jsonl": write_jsonl, "csv": write_csv}
+
+
+def export(rows, fmt, f):
+    """
+    Streams rows to the open file f in `fmt`. Returns the number of rows.
+    """
+    return WRITERS[fmt](rows, f)
@@ -0,0 +1,128 @@
+import os
+import sqlite3
+import time
+
+# Lives inside output/ so it travels with the files it describes
+INDEX_NAME = ".index.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    date       TEXT PRIMARY KEY,
+    theme      TEXT NOT NULL DEFAULT '',
+    channels   TEXT NOT NULL DEFAULT '',
+    written_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS days_by_written ON days (written_at, date);
+"""
+
+
+def index_path(out_dir):
+    return os.path.join(out_dir, INDEX_NAME)
+
+
+def open_index(out_dir, create=True):
+    """
+    Returns a connection to output/.index.sqlite, or None when create=False
+    and no index exists yet (callers then fall back to scanning output/).
+    """
+    path = index_path(out_dir)
+    if not create and not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def record_days(out_dir, rows, now=None):
+    """
+    rows: iterable of (date, theme_id, channel_keys, written) where written is
+    the number of files actually rewritten. Days with nothing rewritten keep
+    their old written_at, matching what their file mtimes say.
+    """
+    now = time.time() if now is None else now
+    conn = open_index(out_dir)
+    with conn:
+        for d, theme, channels, written in rows:
+            conn.execute(
+                "INSERT INTO days (date, theme, channels, written_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(date) DO UPDATE SET theme = excluded.theme, channels = excluded.channels"
+                + (", written_at = excluded.written_at" if written else ""),
+                (d, theme, ",".join(channels), now),
+            )
+    conn.close()
+
+
+def latest_day(out_dir):
+    """
+    Most recently written day (what the dashboard used to get from mtimes),
+    or None when there is no index or it is empty.
+    """
+    conn = open_index(out_dir, create=False)
+    if conn is None:
+        return None
+    try:
+        row = conn.execute(
+            "SELECT date FROM days ORDER BY written_at DESC, date DESC LIMIT 1"
+        ).fetchone()
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+def days_between(out_dir, start, end):
+    """
+    [(date, theme, [channels])] for start <= date <= end (ISO strings), in date order.
+    """
+    conn = open_index(out_dir, create=False)
+    if conn is None:
+        return []
+    try:
+        rows = conn.execute(
+            "SELECT date, theme, channels FROM days WHERE date BETWEEN ? AND ? ORDER BY date",
+            (start, end),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [(d, theme, channels.split(",") if channels else []) for d, theme, channels in rows]
+
+
+def rebuild(out_dir, channels, packed=()):
+    """
+    Recreates the index from the flat files in out_dir plus `packed`, an
+    iterable of (date, theme, channel keys, mtime) from the packed store.
+    `channels` is the (key, prefix, suffix) table from kr3w_store.
+    Theme ids are not recoverable from flat files, so those rows have an
+    empty theme until the day is generated again. Returns the number of days
+    indexed.
+    """
+    found = {}
+    themes = {}
+    for fn in os.listdir(out_dir):
+        for key, prefix, suffix in channels:
+            if fn.startswith(prefix) and fn.endswith(suffix):
+                d = fn[len(prefix):-len(suffix)]
+                if len(d) == 10 and d[4] == "-" and d[7] == "-":
+                    mtime = os.path.getmtime(os.path.join(out_dir, fn))
+                    keys, newest = found.get(d, ([], 0.0))
+                    keys.append(key)
+                    found[d] = (keys, max(newest, mtime))
+
+    for d, theme, packed_keys, mtime in packed:
+        keys, newest = found.get(d, ([], 0.0))
+        keys.extend(k for k in packed_keys if k not in keys)
+        found[d] = (keys, max(newest, mtime))
+        themes[d] = theme
+
+    path = index_path(out_dir)
+    if os.path.exists(path):
+        os.remove(path)
+    conn = open_index(out_dir)
+    order = [key for key, _, _ in channels]
+    with conn:
+        conn.executemany(
+            "INSERT INTO days (date, theme, channels, written_at) VALUES (?, ?, ?, ?)",
+            [(d, themes.get(d, ""), ",".join(sorted(keys, key=order.index)), mtime)
+             for d, (keys, mtime) in found.items()],
+        )
+    conn.close()
+    return len(found)
@@ -0,0 +1,298 @@
+import asyncio
+import os
+import re
+import sqlite3
+import ssl
+import time
+from urllib.parse import urljoin, urlsplit
+
+import kr3w_store
+
+# Lives inside output/ next to .index.sqlite; url -> last check result
+LINKS_CACHE_NAME = ".links.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS links (
+    url       TEXT PRIMARY KEY,
+    status    INTEGER NOT NULL,
+    ok        INTEGER NOT NULL,
+    error     TEXT NOT NULL DEFAULT '',
+    final_url TEXT NOT NULL DEFAULT '',
+    ms        REAL NOT NULL,
+    checked   REAL NOT NULL
+);
+"""
+
+# Recheck a URL once its cached result is this old
+DEFAULT_TTL_HOURS = 24.0
+# Failures (DNS, timeouts, 5xx, ...) are often a passing network blip:
+# they are trusted for at most this long, whatever the TTL
+FAILED_TTL_HOURS = 1.0
+
+MAX_REDIRECTS = 5
+# At most this many connections per (scheme, host, port); idle ones are reused
+PER_HOST = 4
+USER_AGENT = "kr3w-links/1"
+
+URL_RE = re.compile(r"https?://[^\s<>\"'`)\]]+")
+
+
+def cache_path(out_dir):
+    return os.path.join(out_dir, LINKS_CACHE_NAME)
+
+
+def config_urls(cfg):
+    """
+    {url: [where it is referenced]} for every link in the config table and
+    every theme's primary link.
+    """
+    found = {}
+    for name, url in cfg.links.items():
+        found.setdefault(url.strip(), []).append(f"links.{name}")
+    for theme in cfg.themes:
+        url = cfg.links.get(theme.primary_link).strip()
+        found.setdefault(url, []).append(f"theme {theme.id} ({theme.primary_link})")
+    return found
+
+
+def output_urls(out_dir, days, found=None):
+    """
+    Adds every URL printed in the given days' outputs (either layout) to
+    found, as {url: ["<date>/<channel>", ...]}.
+    """
+    found = {} if found is None else found
+    for day in days:
+        blocks = kr3w_store.read_day(out_dir, day)
+        if not blocks:
+            continue
+        for key, text in blocks.items():
+            for url in URL_RE.findall(text):
+                url = url.rstrip(".,;:!?")
+                where = found.setdefault(url, [])
+                # one mention per day is enough context
+                if not where or not where[-1].startswith(day):
+                    where.append(f"{day}/{key}")
+    return found
+
+
+def load_cache(out_dir, urls, ttl_hours, now=None):
+    """
+    {url: result dict} for the urls whose cached result is younger than
+    ttl_hours (or FAILED_TTL_HOURS, if shorter, for failed checks).
+    """
+    now = time.time() if now is None else now
+    path = cache_path(out_dir)
+    if not os.path.exists(path):
+        return {}
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(SCHEMA)
+        rows = conn.execute("SELECT url, status, ok, error, final_url, ms, checked FROM links").fetchall()
+    finally:
+        conn.close()
+    wanted = set(urls)
+    fresh = {}
+    for url, status, ok, error, final_url, ms, checked in rows:
+        ttl = ttl_hours if ok else min(ttl_hours, FAILED_TTL_HOURS)
+        if url in wanted and now - checked < ttl * 3600:
+            fresh[url] = dict(url=url, status=status, ok=bool(ok), error=error, final_url=final_url,
+                              ms=ms, checked=checked)
+    return fresh
+
+
+def save_cache(out_dir, results):
+    conn = sqlite3.connect(cache_path(out_dir))
+    with conn:
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            "INSERT OR REPLACE INTO links (url, status, ok, error, final_url, ms, checked) "
+            "VALUES (:url, :status, :ok, :error, :final_url, :ms, :checked)",
+            [dict(r, ok=int(r["ok"])) for r in results])
+    conn.close()
+
+
+class Response:
+    __slots__ = ("status", "headers", "reusable")
+
+    def __init__(self, status, headers, reusable):
+        self.status = status
+        self.headers = headers
+        self.reusable = reusable
+
+
+class Connections:
+    """
+    Keep-alive HTTP/1.1 connections shared by every check, pooled per
+    (scheme, host, port) so links on the same host reuse one socket.
+    """
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.idle = {}
+        self.limits = {}
+        self.ssl = ssl.create_default_context()
+        self.opened = self.requests = 0
+
+    def _limit(self, origin):
+        sem = self.limits.get(origin)
+        if sem is None:
+            sem = self.limits[origin] = asyncio.Semaphore(PER_HOST)
+        return sem
+
+    async def _open(self, scheme, host, port):
+        conn = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=self.ssl if scheme == "https" else None,
+                                    server_hostname=host if scheme == "https" else None),
+            self.timeout)
+        # only connections that actually opened count (not refused/timed-out attempts)
+        self.opened += 1
+        return conn
+
+    async def request(self, method, url):
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"not an http(s) URL: {url!r}")
+        host = parts.hostname
+        port = parts.port or (443 if scheme == "https" else 80)
+        origin = (scheme, host, port)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        host_header = host if parts.port is None else f"{host}:{port}"
+        head = (f"{method} {target} HTTP/1.1\r\nHost: {host_header}\r\nUser-Agent: {USER_AGENT}\r\n"
+                f"Accept: */*\r\nConnection: keep-alive\r\n\r\n").encode("latin-1")
+
+        async with self._limit(origin):
+            idle = self.idle.setdefault(origin, [])
+            # a pooled socket may have been closed by the server meanwhile:
+            # retry once on a fresh one
+            for attempt in (0, 1):
+                reused = bool(idle) and attempt == 0
+                reader, writer = idle.pop() if reused else await self._open(scheme, host, port)
+                try:
+                    self.requests += 1
+                    writer.write(head)
+                    resp = await asyncio.wait_for(self._read(reader, method), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError, EOFError):
+                    writer.close()
+                    if reused:
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                if resp.reusable:
+                    idle.append((reader, writer))
+                else:
+                    writer.close()
+                return resp
+
+    async def _read(self, reader, method):
+        line = await reader.readline()
+        if not line:
+            raise EOFError("connection closed")
+        parts = line.decode("latin-1").split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+            raise ValueError(f"bad status line: {line[:60]!r}")
+        version, status = parts[0], int(parts[1])
+        headers = {}
+        while True:
+            h = await reader.readline()
+            if h in (b"\r\n", b"\n"):
+                break
+            if not h:
+                raise EOFError("connection closed in headers")
+            name, _, value = h.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        reusable = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            return Response(status, headers, reusable)
+        # drain the body so the connection can carry the next request
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    # trailers end with a blank line
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                await reader.readexactly(size + 2)
+        elif "content-length" in headers:
+            await reader.readexactly(int(headers["content-length"]))
+        else:
+            await reader.read()
+            reusable = False
+        return Response(status, headers, reusable)
+
+    def close(self):
+        for conns in self.idle.values():
+            for _, writer in conns:
+                writer.close()
+        self.idle.clear()
+
+
+async def check_url(conns, url):
+    """
+    HEAD (falling back to GET for servers that refuse HEAD), following
+    redirects. Returns a result dict; ok means a final 2xx/3xx status.
+    """
+    t0 = time.perf_counter()
+    result = dict(url=url, status=0, ok=False, error="", final_url=url, ms=0.0, checked=time.time())
+    current = url
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            resp = await conns.request("HEAD", current)
+            if resp.status in (405, 501):
+                resp = await conns.request("GET", current)
+            location = resp.headers.get("location")
+            if resp.status in (301, 302, 303, 307, 308) and location:
+                current = urljoin(current, location)
+                continue
+            result.update(status=resp.status, ok=200 <= resp.status < 400)
+            if not result["ok"]:
+                result["error"] = f"HTTP {resp.status}"
+            break
+        else:
+            result["error"] = f"more than {MAX_REDIRECTS} redirects"
+    except asyncio.TimeoutError:
+        result["error"] = "timed out"
+    except (OSError, ValueError, EOFError, asyncio.IncompleteReadError) as e:
+        result["error"] = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+    result["final_url"] = current
+    result["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    return result
+
+
+async def check_all(urls, concurrency=16, timeout=10.0):
+    """
+    Checks urls concurrently over shared keep-alive connections.
+    Returns ([result dict], connections opened, requests sent).
+    """
+    conns = Connections(timeout)
+    gate = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(url):
+        async with gate:
+            return await check_url(conns, url)
+
+    try:
+        results = await asyncio.gather(*(one(url) for url in urls))
+    finally:
+        conns.close()
+    return results, conns.opened, conns.requests
+
+
+def check(out_dir, found, ttl_hours=DEFAULT_TTL_HOURS, concurrency=16, timeout=10.0, refresh=False):
+    """
+    Results for every url in found, re-checking only those without a fresh
+    cached result. Returns ({url: result}, {"checked", "cached", "opened",
+    "requests"}).
+    """
+    cached = {} if refresh else load_cache(out_dir, found, ttl_hours)
+    stale = [url for url in found if url not in cached]
+    fresh, opened, requests = [], 0, 0
+    if stale:
+        fresh, opened, requests = asyncio.run(check_all(stale, concurrency, timeout))
+        save_cache(out_dir, fresh)
+    results = dict(cached)
+    results.update((r["url"], r) for r in fresh)
+    return results, {"checked": len(stale), "cached": len(cached), "opened": opened, "requests": requests}
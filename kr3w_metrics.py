@@ -0,0 +1,121 @@
+import json
+import os
+import time
+
+# logs/metrics.jsonl — one JSON line per (run, stage), next to the text run.log
+METRICS_NAME = "metrics.jsonl"
+
+
+class Spans:
+    """
+    Aggregated timing spans for one run: stage -> [count, seconds, max
+    seconds, bytes]. Cheap enough to keep on for every run, and small enough
+    to ship back from worker processes.
+    """
+    __slots__ = ("stats",)
+
+    def __init__(self):
+        self.stats = {}
+
+    def add(self, stage, secs, nbytes=0):
+        s = self.stats.get(stage)
+        if s is None:
+            self.stats[stage] = [1, secs, secs, nbytes]
+            return
+        s[0] += 1
+        s[1] += secs
+        if secs > s[2]:
+            s[2] = secs
+        s[3] += nbytes
+
+    def merge(self, stats):
+        for stage, (n, secs, peak, nbytes) in stats.items():
+            s = self.stats.get(stage)
+            if s is None:
+                self.stats[stage] = [n, secs, peak, nbytes]
+                continue
+            s[0] += n
+            s[1] += secs
+            s[2] = max(s[2], peak)
+            s[3] += nbytes
+
+
+def metrics_path(log_dir):
+    return os.path.join(log_dir, METRICS_NAME)
+
+
+def new_run_id():
+    return time.strftime("%Y%m%dT%H%M%S") + f"-{os.getpid()}"
+
+
+def write_run(log_dir, run_id, spans, **extra):
+    """
+    Appends one line per stage, plus a "run" line carrying `extra`
+    (days, written, ...) and the total wall time in extra["ms"].
+    """
+    ts = round(time.time(), 3)
+    lines = []
+    for stage, (n, secs, peak, nbytes) in spans.stats.items():
+        rec = {"run": run_id, "ts": ts, "stage": stage, "n": n,
+               "ms": round(secs * 1000, 3), "max_ms": round(peak * 1000, 3)}
+        if nbytes:
+            rec["bytes"] = nbytes
+        lines.append(json.dumps(rec))
+    lines.append(json.dumps(dict({"run": run_id, "ts": ts, "stage": "run"}, **extra)))
+    with open(metrics_path(log_dir), "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def load_runs(log_dir, last=20):
+    """
+    {run id: {stage: record}} for the last `last` runs, oldest first.
+    """
+    runs = {}
+    try:
+        with open(metrics_path(log_dir), "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                runs.setdefault(rec.get("run"), {})[rec.get("stage")] = rec
+    except FileNotFoundError:
+        return {}
+    ids = list(runs)[-last:]
+    return {run_id: runs[run_id] for run_id in ids}
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    k = (len(values) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def summarize(runs):
+    """
+    [(stage, runs seen, p50 ms, p95 ms, mean ms per op, mean bytes per run)]
+    across runs, slowest p50 first.
+    """
+    per_stage = {}
+    for stages in runs.values():
+        for stage, rec in stages.items():
+            if stage != "run":
+                per_stage.setdefault(stage, []).append(rec)
+    rows = []
+    for stage, recs in per_stage.items():
+        ms = [r["ms"] for r in recs]
+        ops = sum(r["n"] for r in recs)
+        rows.append((
+            stage,
+            len(recs),
+            percentile(ms, 0.50),
+            percentile(ms, 0.95),
+            sum(ms) / ops if ops else 0.0,
+            sum(r.get("bytes", 0) for r in recs) / len(recs),
+        ))
+    rows.sort(key=lambda r: -r[2])
+    return rows
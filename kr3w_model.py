@@ -0,0 +1,274 @@
+import os
+import pickle
+
+# Bump when the compiled classes change shape so old snapshots are ignored
+SNAPSHOT_VERSION = 4
+
+STORAGE_BACKENDS = ("flat", "packed")
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+# Defaults if not in config (same pools kr3w.py has always fallen back to)
+DEFAULT_HOOKS = (
+    "One Link. One Hub. Everything Connected.",
+    "If you’re building something real, you need one place that ties it all together.",
+    "Creators don’t need clutter. They need clarity.",
+)
+DEFAULT_THEMES = (
+    {"id": "hub", "label": "hub-first", "primary_link": "linktree"},
+    {"id": "merch", "label": "merch", "primary_link": "tiktok_shop"},
+    {"id": "wellness", "label": "wellness", "primary_link": "mydailychoice_daily_spray"},
+)
+DEFAULT_CTAS = (
+    "Tap the hub 👇",
+    "Bookmark the hub and stay locked in 🔥",
+    "Start here 👇",
+)
+DEFAULT_HASHTAGS = ("#LinkInBio", "#CreatorLife", "#SmallBusiness")
+
+
+class ConfigError(ValueError):
+    pass
+
+
+class Brand:
+    __slots__ = ("name", "tagline", "sms_keyword")
+
+    def __init__(self, name, tagline, sms_keyword):
+        self.name = name
+        self.tagline = tagline
+        self.sms_keyword = sms_keyword
+
+
+class Theme:
+    __slots__ = ("id", "label", "primary_link", "hooks", "ctas")
+
+    def __init__(self, id, label, primary_link, hooks=(), ctas=()):
+        self.id = id
+        self.label = label
+        self.primary_link = primary_link
+        self.hooks = hooks
+        self.ctas = ctas
+
+    def as_dict(self):
+        return {
+            "id": self.id,
+            "label": self.label,
+            "primary_link": self.primary_link,
+            "hooks": list(self.hooks),
+            "ctas": list(self.ctas),
+        }
+
+
+class LinkTable:
+    __slots__ = ("urls",)
+
+    def __init__(self, urls):
+        self.urls = urls
+
+    def __contains__(self, key):
+        return key in self.urls
+
+    def get(self, key, default=""):
+        return self.urls.get(key, default)
+
+    def items(self):
+        return self.urls.items()
+
+
+class Rotation:
+    """
+    Weekday index -> tuple of Theme objects (date.weekday(): 0 = mon).
+    Empty tuple means "no rotation for that day".
+    """
+    __slots__ = ("by_weekday",)
+
+    def __init__(self, by_weekday):
+        self.by_weekday = by_weekday
+
+    def for_weekday(self, weekday):
+        return self.by_weekday[weekday]
+
+
+class Config:
+    __slots__ = ("brand", "timezone", "links", "themes", "themes_by_id", "rotation",
+                 "hooks", "ctas", "hashtags", "tag_str", "storage", "dedup", "no_repeat_days", "fingerprint", "raw")
+
+    def get(self, key, default=None):
+        # Escape hatch for keys the model does not compile
+        return self.raw.get(key, default)
+
+
+def _str_list(raw, key, default):
+    items = raw.get(key)
+    if items is None:
+        return tuple(default)
+    if not isinstance(items, list) or not all(isinstance(i, str) for i in items):
+        raise ConfigError(f"'{key}' must be a list of strings")
+    return tuple(items)
+
+
+def _compile_brand(raw):
+    brand = raw.get("brand", {})
+    if isinstance(brand, str):
+        brand = {"name": brand}
+    if not isinstance(brand, dict):
+        raise ConfigError("'brand' must be an object or a string")
+    return Brand(
+        brand.get("name") or "Sinist3rKr3w",
+        brand.get("tagline", "Where you matter most."),
+        brand.get("sms_keyword", "KR3W"),
+    )
+
+
+def _compile_links(raw):
+    links = raw.get("links", {})
+    if not isinstance(links, dict):
+        raise ConfigError("'links' must be an object of name -> url")
+    for k, v in links.items():
+        if not isinstance(v, str) or not v:
+            raise ConfigError(f"link '{k}' must be a non-empty string")
+    return LinkTable(dict(links))
+
+
+def _compile_themes(raw, links):
+    items = raw.get("themes")
+    if items is None:
+        items = DEFAULT_THEMES
+    if not isinstance(items, (list, tuple)):
+        raise ConfigError("'themes' must be a list")
+    if not items:
+        raise ConfigError("'themes' is empty")
+
+    themes = []
+    by_id = {}
+    for i, t in enumerate(items):
+        if not isinstance(t, dict) or not t.get("id"):
+            raise ConfigError(f"themes[{i}] needs an 'id'")
+        tid = t["id"]
+        if tid in by_id:
+            raise ConfigError(f"duplicate theme id '{tid}'")
+        primary = t.get("primary_link", "linktree")
+        if primary not in links:
+            raise ConfigError(f"theme '{tid}' uses primary_link '{primary}' which is not in 'links'")
+        theme = Theme(
+            tid,
+            t.get("label") or tid,
+            primary,
+            _str_list(t, "hooks", ()),
+            _str_list(t, "ctas", ()),
+        )
+        themes.append(theme)
+        by_id[tid] = theme
+    return tuple(themes), by_id
+
+
+def _compile_rotation(raw, themes_by_id):
+    rotation = raw.get("weekly_rotation", {})
+    if not isinstance(rotation, dict):
+        raise ConfigError("'weekly_rotation' must be an object of weekday -> [theme ids]")
+    for dow in rotation:
+        if dow not in WEEKDAYS:
+            raise ConfigError(f"weekly_rotation has unknown weekday '{dow}'")
+
+    by_weekday = []
+    for dow in WEEKDAYS:
+        ids = rotation.get(dow) or []
+        for tid in ids:
+            if tid not in themes_by_id:
+                raise ConfigError(f"weekly_rotation['{dow}'] references unknown theme '{tid}'")
+        by_weekday.append(tuple(themes_by_id[tid] for tid in ids))
+    return Rotation(tuple(by_weekday))
+
+
+def fingerprint_raw(raw):
+    import hashlib
+    import json
+
+    text = json.dumps(raw, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def compile_config(raw):
+    """
+    Validates a parsed kr3w_config.json dict and compiles it into a Config.
+    Raises ConfigError on anything that would otherwise silently fall back.
+    """
+    if not isinstance(raw, dict):
+        raise ConfigError("config root must be an object")
+
+    cfg = Config()
+    cfg.raw = raw
+    cfg.brand = _compile_brand(raw)
+    cfg.timezone = raw.get("timezone", "")
+    cfg.links = _compile_links(raw)
+    cfg.themes, cfg.themes_by_id = _compile_themes(raw, cfg.links)
+    cfg.rotation = _compile_rotation(raw, cfg.themes_by_id)
+    cfg.hooks = _str_list(raw, "hooks", DEFAULT_HOOKS)
+    cfg.ctas = _str_list(raw, "ctas", DEFAULT_CTAS)
+    cfg.hashtags = _str_list(raw, "hashtags", DEFAULT_HASHTAGS)
+    cfg.tag_str = " ".join(cfg.hashtags[:6])
+    cfg.storage = raw.get("storage", "flat")
+    if cfg.storage not in STORAGE_BACKENDS:
+        raise ConfigError(f"'storage' must be one of {', '.join(STORAGE_BACKENDS)}")
+    cfg.dedup = raw.get("dedup", False)
+    if not isinstance(cfg.dedup, bool):
+        raise ConfigError("'dedup' must be true or false")
+    cfg.no_repeat_days = raw.get("no_repeat_days", 0)
+    if not isinstance(cfg.no_repeat_days, int) or cfg.no_repeat_days < 0:
+        raise ConfigError("'no_repeat_days' must be a whole number >= 0")
+    cfg.fingerprint = fingerprint_raw(raw)
+    return cfg
+
+
+def _parse(cfg_path):
+    import json
+
+    with open(cfg_path, "r", encoding="utf-8") as f:
+        try:
+            raw = json.load(f)
+        except ValueError as e:
+            raise ConfigError(f"{os.path.basename(cfg_path)}: {e}") from None
+    return compile_config(raw)
+
+
+def snapshot_path(cfg_path):
+    return cfg_path + ".snapshot"
+
+
+def load_config_cached(cfg_path):
+    """
+    Like load_config(), but reuses a pickled snapshot of the compiled Config
+    stored next to the JSON file. The snapshot is only trusted while the JSON
+    file's mtime and size are unchanged. Returns (cfg, from_snapshot).
+    """
+    cfg_path = os.fspath(cfg_path)
+    st = os.stat(cfg_path)
+    stamp = (SNAPSHOT_VERSION, st.st_mtime_ns, st.st_size)
+    snap = snapshot_path(cfg_path)
+    try:
+        with open(snap, "rb") as f:
+            saved_stamp, cfg = pickle.load(f)
+        if saved_stamp == stamp:
+            return cfg, True
+    except Exception:
+        # missing, truncated or from an older layout: rebuild below
+        pass
+
+    cfg = _parse(cfg_path)
+    try:
+        tmp = snap + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump((stamp, cfg), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, snap)
+    except OSError:
+        # read-only checkout etc. — the snapshot is only an optimization
+        pass
+    return cfg, False
+
+
+def load_config(cfg_path):
+    """
+    Reads + compiles the config at cfg_path. Shared by kr3w.py and scripts/.
+    """
+    return load_config_cached(cfg_path)[0]
@@ -0,0 +1,263 @@
+import os
+import sqlite3
+import time
+
+# logs/run.log is the live segment; rotated ones become run.log-<stamp>.gz
+LOG_NAME = "run.log"
+
+# logs/.runlog.sqlite — date -> (segment, byte offset) for every "Generated:" line
+LOG_INDEX_NAME = ".runlog.sqlite"
+
+# Rotate the live segment once it is this big or this old
+ROTATE_BYTES = 1 << 20
+ROTATE_DAYS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    name    TEXT PRIMARY KEY,
+    started REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS days (
+    date       TEXT NOT NULL,
+    theme      TEXT NOT NULL DEFAULT '',
+    segment    TEXT NOT NULL,
+    offset     INTEGER NOT NULL,
+    run_offset INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS days_by_date ON days (date);
+"""
+
+HEADER_PREFIX = b"=== KR3W "
+GENERATED_PREFIX = b"Generated: "
+
+
+def log_path(log_dir):
+    return os.path.join(log_dir, LOG_NAME)
+
+
+def open_index(log_dir):
+    conn = sqlite3.connect(os.path.join(log_dir, LOG_INDEX_NAME))
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def parse_generated(line):
+    """
+    (date, theme) from a b"Generated: <date> theme=<id>" line, else None.
+    Old shell-script lines ("Generated: blog_<date>.md") have no theme.
+    """
+    if not line.startswith(GENERATED_PREFIX):
+        return None
+    parts = line[len(GENERATED_PREFIX):].decode("utf-8", "replace").split()
+    if not parts:
+        return None
+    d, theme = parts[0], ""
+    for p in parts[1:]:
+        if p.startswith("theme="):
+            theme = p[len("theme="):]
+    if len(d) != 10:
+        # blog_2026-01-01.md -> 2026-01-01
+        for token in d.replace(".", "_").split("_"):
+            if len(token) == 10 and token[4] == "-" and token[7] == "-":
+                d = token
+                break
+        else:
+            return None
+    return d, theme
+
+
+class RunLog:
+    """
+    Appends to logs/run.log (binary, so byte offsets are exact) and indexes
+    each "Generated:" line as it is written. Rotation is checked on close.
+    """
+    def __init__(self, log_dir):
+        self.log_dir = log_dir
+        _ensure_indexed(log_dir)
+        self.f = open(log_path(log_dir), "ab")
+        self.f.seek(0, os.SEEK_END)
+        self.offset = self.f.tell()
+        self.run_offset = self.offset
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, text):
+        b = text.encode("utf-8")
+        if b.startswith(HEADER_PREFIX):
+            self.run_offset = self.offset
+        self.f.write(b)
+        self.offset += len(b)
+
+    def generated(self, d, theme_id):
+        self.rows.append((d, theme_id, LOG_NAME, self.offset, self.run_offset))
+        self.write(f"Generated: {d} theme={theme_id}\n")
+
+    def close(self):
+        self.f.close()
+        conn = open_index(self.log_dir)
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO segments (name, started) VALUES (?, ?)", (LOG_NAME, time.time()))
+            conn.executemany(
+                "INSERT INTO days (date, theme, segment, offset, run_offset) VALUES (?, ?, ?, ?, ?)", self.rows)
+        conn.close()
+        maybe_rotate(self.log_dir)
+
+
+def _ensure_indexed(log_dir):
+    # A run.log from before the index existed gets indexed once, in full
+    if not os.path.exists(log_path(log_dir)):
+        return
+    conn = open_index(log_dir)
+    try:
+        known = conn.execute("SELECT 1 FROM segments LIMIT 1").fetchone()
+    finally:
+        conn.close()
+    if not known:
+        rebuild_index(log_dir)
+
+
+def maybe_rotate(log_dir, max_bytes=ROTATE_BYTES, max_days=ROTATE_DAYS, force=False):
+    """
+    Gzips the live segment to run.log-<stamp>.gz when it is over max_bytes
+    or older than max_days (or force). Index rows move with it; offsets stay
+    valid because they count uncompressed bytes. Returns the new segment
+    name or None.
+    """
+    path = log_path(log_dir)
+    try:
+        size = os.path.getsize(path)
+    except FileNotFoundError:
+        return None
+    if size == 0:
+        return None
+    conn = open_index(log_dir)
+    try:
+        row = conn.execute("SELECT started FROM segments WHERE name = ?", (LOG_NAME,)).fetchone()
+        started = row[0] if row else os.path.getmtime(path)
+        if not (force or size >= max_bytes or time.time() - started >= max_days * 86400):
+            return None
+
+        # only needed when a segment is actually rotated
+        import gzip
+        import shutil
+
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime())
+        tmp = os.path.join(log_dir, f"{LOG_NAME}-{stamp}.gz.{os.getpid()}.tmp")
+        with open(path, "rb") as src, gzip.open(tmp, "wb", compresslevel=9) as dst:
+            shutil.copyfileobj(src, dst, 1 << 16)
+        name = _claim_segment(log_dir, tmp, stamp)
+        with conn:
+            conn.execute("UPDATE days SET segment = ? WHERE segment = ?", (name, LOG_NAME))
+            conn.execute("DELETE FROM segments WHERE name = ?", (LOG_NAME,))
+            conn.execute("INSERT OR REPLACE INTO segments (name, started) VALUES (?, ?)", (name, started))
+        os.remove(path)
+        return name
+    finally:
+        conn.close()
+
+
+def _claim_segment(log_dir, tmp, stamp):
+    # os.link never replaces an existing segment: a second rotation within
+    # the same second gets run.log-<stamp>-01.gz, -02, ...
+    n = 0
+    while True:
+        name = f"{LOG_NAME}-{stamp}.gz" if n == 0 else f"{LOG_NAME}-{stamp}-{n:02d}.gz"
+        path = os.path.join(log_dir, name)
+        try:
+            os.link(tmp, path)
+        except FileExistsError:
+            n += 1
+            continue
+        except OSError:
+            # no hardlinks on this filesystem: check, then rename
+            if os.path.exists(path):
+                n += 1
+                continue
+            os.replace(tmp, path)
+            return name
+        os.remove(tmp)
+        return name
+
+
+def _open_segment(log_dir, name):
+    path = os.path.join(log_dir, name)
+    if name.endswith(".gz"):
+        import gzip
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def rebuild_index(log_dir):
+    """
+    Re-indexes every segment (for logs written before the index existed).
+    Returns the number of "Generated:" lines indexed.
+    """
+    # sorted without ".gz" so run.log-<stamp>.gz comes before run.log-<stamp>-01.gz
+    names = sorted((fn for fn in os.listdir(log_dir) if fn.startswith(LOG_NAME + "-") and fn.endswith(".gz")),
+                   key=lambda fn: fn[:-len(".gz")])
+    if os.path.exists(log_path(log_dir)):
+        names.append(LOG_NAME)
+    rows = []
+    segments = []
+    for name in names:
+        offset = run_offset = 0
+        with _open_segment(log_dir, name) as f:
+            for line in f:
+                if line.startswith(HEADER_PREFIX):
+                    run_offset = offset
+                else:
+                    parsed = parse_generated(line)
+                    if parsed:
+                        rows.append(parsed + (name, offset, run_offset))
+                offset += len(line)
+        segments.append((name, os.path.getmtime(os.path.join(log_dir, name))))
+
+    conn = open_index(log_dir)
+    with conn:
+        conn.execute("DELETE FROM days")
+        conn.execute("DELETE FROM segments")
+        conn.executemany("INSERT INTO segments (name, started) VALUES (?, ?)", segments)
+        conn.executemany(
+            "INSERT INTO days (date, theme, segment, offset, run_offset) VALUES (?, ?, ?, ?, ?)", rows)
+    conn.close()
+    return len(rows)
+
+
+def query(log_dir, day):
+    """
+    [(segment, run header line, generated line)] for every run that
+    generated `day`, oldest first. Only the segments holding matches are
+    opened; gzip segments are read up to the last needed offset.
+    """
+    _ensure_indexed(log_dir)
+    conn = open_index(log_dir)
+    try:
+        rows = conn.execute(
+            "SELECT segment, offset, run_offset FROM days WHERE date = ? ORDER BY rowid", (day,)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    by_segment = {}
+    for segment, offset, run_offset in rows:
+        by_segment.setdefault(segment, []).append((offset, run_offset))
+
+    out = []
+    for segment, hits in by_segment.items():
+        try:
+            f = _open_segment(log_dir, segment)
+        except FileNotFoundError:
+            continue
+        # read in offset order: gzip streams can only seek forward cheaply
+        lines = {}
+        with f:
+            for offset in sorted({o for hit in hits for o in hit}):
+                f.seek(offset)
+                lines[offset] = f.readline().decode("utf-8", "replace").rstrip("\n")
+        out.extend((segment, lines[run_offset], lines[offset]) for offset, run_offset in hits)
+    return out
@@ -0,0 +1,193 @@
+import os
+import pickle
+import random
+from array import array
+from datetime import date, timedelta
+
+# Bump when the selection rule changes so cached tables are rebuilt
+SCHEDULE_VERSION = 2
+
+# The no-repeat chain always starts here, so a day's hook/CTA never depends
+# on which date a run (or a cached table) happened to start from.
+NO_REPEAT_ANCHOR = date(2020, 1, 1)
+
+# How far ahead a freshly compiled table reaches past the requested range
+DEFAULT_HORIZON = 366
+
+
+def theme_id_for(cfg, day: date):
+    """
+    The rotation rule, for a single day:
+    - weekdays listed in weekly_rotation cycle through their themes week by
+      week (so mon: [hub, youtube] alternates hub / youtube / hub ...);
+    - other weekdays cycle through every theme day by day.
+    """
+    todays = cfg.rotation.for_weekday(day.weekday())
+    if todays:
+        return todays[(day.toordinal() // 7) % len(todays)].id
+    return cfg.themes[day.toordinal() % len(cfg.themes)].id
+
+
+def natural_picks(cfg, theme, day: date):
+    """
+    (hook index, cta index) exactly as kr3w_engine.draw_day draws them.
+    """
+    rng = random.Random(day.isoformat())
+    hooks = theme.hooks or cfg.hooks
+    ctas = theme.ctas or cfg.ctas
+    hi = rng.choice(range(len(hooks))) if hooks else 0
+    ci = rng.choice(range(len(ctas))) if ctas else 0
+    return hi, ci
+
+
+class RepeatGuard:
+    """
+    Remembers the last day each (theme, hook, cta) combo ran, so picking a
+    day's combo costs O(pool) lookups instead of a scan over history.
+    """
+    __slots__ = ("window", "last_used")
+
+    def __init__(self, window):
+        self.window = window
+        self.last_used = {}
+
+    def choose(self, theme_id, hi, ci, n_hooks, n_ctas, ordinal):
+        # Keep the natural draw when it is free; otherwise walk the pools
+        # (CTA first, so the hook survives when possible) for the first combo
+        # not used in the window, falling back to the least recently used.
+        best, best_seen = None, None
+        for dh in range(max(n_hooks, 1)):
+            h = (hi + dh) % max(n_hooks, 1)
+            for dc in range(max(n_ctas, 1)):
+                c = (ci + dc) % max(n_ctas, 1)
+                seen = self.last_used.get((theme_id, h, c))
+                if seen is None or ordinal - seen > self.window:
+                    self.last_used[(theme_id, h, c)] = ordinal
+                    return h, c
+                if best_seen is None or seen < best_seen:
+                    best, best_seen = (h, c), seen
+        self.last_used[(theme_id,) + best] = ordinal
+        return best
+
+
+class Schedule:
+    """
+    Compiled calendar: one theme index per day from `start`, so lookups are a
+    subtraction and an array read. With no_repeat > 0 it also carries the
+    hook/CTA index chosen for each day by RepeatGuard.
+    """
+    __slots__ = ("fingerprint", "start", "theme_ids", "table", "no_repeat", "hooks", "ctas")
+
+    def __init__(self, fingerprint, start, theme_ids, table, no_repeat=0, hooks=None, ctas=None):
+        self.fingerprint = fingerprint
+        self.start = start
+        self.theme_ids = theme_ids
+        self.table = table
+        self.no_repeat = no_repeat
+        self.hooks = hooks
+        self.ctas = ctas
+
+    @property
+    def end(self):
+        return self.start + timedelta(days=len(self.table) - 1)
+
+    def covers(self, start: date, end: date):
+        return self.start <= start and end <= self.end
+
+    def theme_id(self, day: date):
+        i = (day - self.start).days
+        if 0 <= i < len(self.table):
+            return self.theme_ids[self.table[i]]
+        raise KeyError(day.isoformat())
+
+    def picks(self, day: date):
+        """
+        (hook index, cta index) planned for `day`, or None when this schedule
+        does not plan hooks/CTAs (no_repeat == 0) or does not cover the day.
+        """
+        if not self.no_repeat:
+            return None
+        i = (day - self.start).days
+        if 0 <= i < len(self.table):
+            return self.hooks[i], self.ctas[i]
+        return None
+
+    def days(self, start: date, end: date):
+        """
+        Yields (day, theme id) for start..end inclusive.
+        """
+        day = start
+        while day <= end:
+            yield day, self.theme_id(day)
+            day += timedelta(days=1)
+
+
+def compile_schedule(cfg, start: date, end: date, no_repeat=0):
+    """
+    With no_repeat > 0 the table starts at NO_REPEAT_ANCHOR at the latest and
+    walks forward once, so every day's combo is the same whatever range
+    was asked for.
+    """
+    if no_repeat:
+        start = min(start, NO_REPEAT_ANCHOR)
+    theme_ids = tuple(t.id for t in cfg.themes)
+    position = {tid: i for i, tid in enumerate(theme_ids)}
+    table = array("H")
+    hooks = array("H") if no_repeat else None
+    ctas = array("H") if no_repeat else None
+    guard = RepeatGuard(no_repeat)
+    day = start
+    while day <= end:
+        tid = theme_id_for(cfg, day)
+        table.append(position[tid])
+        if no_repeat:
+            theme = cfg.themes_by_id[tid]
+            hi, ci = natural_picks(cfg, theme, day)
+            if day >= NO_REPEAT_ANCHOR:
+                n_hooks = len(theme.hooks or cfg.hooks)
+                n_ctas = len(theme.ctas or cfg.ctas)
+                hi, ci = guard.choose(tid, hi, ci, n_hooks, n_ctas, day.toordinal())
+            hooks.append(hi)
+            ctas.append(ci)
+        day += timedelta(days=1)
+    return Schedule(cfg.fingerprint, start, theme_ids, table, no_repeat, hooks, ctas)
+
+
+def schedule_path(cfg_path):
+    return os.fspath(cfg_path) + ".schedule"
+
+
+def load_schedule(cfg, cfg_path, start: date, end: date, no_repeat=0):
+    """
+    Returns a Schedule covering start..end, reusing the table cached next to
+    the config when it was compiled from the same config fingerprint and
+    no_repeat window.
+    Otherwise compiles start..end+DEFAULT_HORIZON (widened to keep whatever
+    the cache already covered) and saves it.
+    """
+    path = schedule_path(cfg_path)
+    cached = None
+    try:
+        with open(path, "rb") as f:
+            version, cached = pickle.load(f)
+        if (version != SCHEDULE_VERSION or cached.fingerprint != cfg.fingerprint
+                or cached.no_repeat != no_repeat):
+            cached = None
+    except Exception:
+        cached = None
+
+    if cached is not None and cached.covers(start, end):
+        return cached
+
+    new_start, new_end = start, end + timedelta(days=DEFAULT_HORIZON)
+    if cached is not None:
+        new_start, new_end = min(new_start, cached.start), max(new_end, cached.end)
+    sched = compile_schedule(cfg, new_start, new_end, no_repeat)
+    try:
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump((SCHEDULE_VERSION, sched), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return sched
@@ -0,0 +1,456 @@
+import json
+import os
+
+# (channel key, filename prefix, suffix) for the legacy flat layout
+CHANNELS = [
+    ("blog", "blog_", ".md"),
+    ("ad_facebook", "ad_facebook_", ".txt"),
+    ("ad_tiktok", "ad_tiktok_", ".txt"),
+    ("caption_short", "caption_short_", ".txt"),
+    ("sms_cta", "sms_cta_", ".txt"),
+    ("youtube", "youtube_", ".txt"),
+]
+
+# output/packed/YYYY-MM.jsonl — one JSON record per day, sorted by date
+PACK_DIR = "packed"
+
+# output/.manifest.json — "<date>/<channel>" -> {"hash", "config"}
+MANIFEST_NAME = ".manifest.json"
+
+# output/blobs/ab/abcd… — one file per unique channel text (sha256)
+BLOB_DIR = "blobs"
+
+
+def content_hash(text):
+    import hashlib
+
+    # str or already-encoded bytes (write_assets encodes once for both)
+    data = text.encode("utf-8") if isinstance(text, str) else text
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_manifest(out_dir):
+    """
+    Manifest maps "<date>/<channel>" -> {"hash": ..., "config": ...}.
+    A missing or unreadable manifest just means every file gets written.
+    """
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get("entries", {})
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_manifest(out_dir, entries):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "entries": entries}, f, sort_keys=True, indent=1)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def _tmp_path(path):
+    # Hidden, so output/ scanners (which match blog_ / ad_… prefixes) skip it
+    head, tail = os.path.split(path)
+    return os.path.join(head, f".{tail}.{os.getpid()}.tmp")
+
+
+class BatchWriter:
+    """
+    Stages files next to their final path and publishes them by rename, so
+    readers (publish.sh, git add) only ever see a whole old or a whole new
+    file. publish() renames everything staged so far; sync() then fsyncs
+    each touched directory once, however many files went in.
+    Renaming over a path also never writes through a hardlinked blob.
+    """
+    __slots__ = ("staged", "dirs")
+
+    def __init__(self):
+        self.staged = []
+        self.dirs = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def stage_bytes(self, path, data):
+        tmp = _tmp_path(path)
+        # raw fd + os.write: no per-file TextIOWrapper/BufferedWriter
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        self.staged.append((tmp, path))
+        return len(data)
+
+    def stage(self, path, content):
+        return self.stage_bytes(path, content.encode("utf-8"))
+
+    def stage_link(self, src, path):
+        """
+        Stages `path` as a hardlink to `src`. Raises OSError where hardlinks
+        are not supported (callers fall back to stage()).
+        """
+        tmp = _tmp_path(path)
+        try:
+            os.remove(tmp)
+        except FileNotFoundError:
+            pass
+        os.link(src, tmp)
+        self.staged.append((tmp, path))
+
+    def publish(self):
+        for tmp, path in self.staged:
+            os.replace(tmp, path)
+            self.dirs.add(os.path.dirname(path) or ".")
+        n = len(self.staged)
+        self.staged = []
+        return n
+
+    def discard(self):
+        for tmp, _ in self.staged:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+        self.staged = []
+
+    def sync(self):
+        for d in self.dirs:
+            try:
+                fd = os.open(d, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.fsync(fd)
+            except OSError:
+                # some Android storage can't fsync a directory
+                pass
+            finally:
+                os.close(fd)
+        self.dirs.clear()
+
+    def close(self):
+        self.publish()
+        self.sync()
+
+
+def write_text(path, content):
+    # Single-file temp + rename (see BatchWriter for many files); str or bytes
+    w = BatchWriter()
+    try:
+        w.stage_bytes(path, content.encode("utf-8") if isinstance(content, str) else content)
+        w.publish()
+    except BaseException:
+        w.discard()
+        raise
+
+
+def blob_path(out_dir, h):
+    return os.path.join(out_dir, BLOB_DIR, h[:2], h)
+
+
+def _blob_matches(path, data):
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except FileNotFoundError:
+        return False
+
+
+def put_blob(out_dir, content, h=None):
+    """
+    Stores content once under output/blobs/ and returns its hash. An
+    existing blob is only trusted if it still holds exactly this content:
+    anything that wrote through one of its hardlinks in place gets it
+    replaced by a fresh inode (the flat files still on the damaged one are
+    relinked by link_blob).
+    """
+    h = h or content_hash(content)
+    path = blob_path(out_dir, h)
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    if not _blob_matches(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_text(path, data)
+    return h
+
+
+def get_blob(out_dir, h):
+    with open(blob_path(out_dir, h), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def link_blob(out_dir, h, content, path, writer=None):
+    """
+    Makes the legacy flat file at `path` a hardlink to the blob for `h`.
+    Filesystems without hardlinks (some Android storage) get a plain copy.
+    With a BatchWriter the link is only staged; publishing it is up to the
+    caller. Returns False when nothing needed staging: path already is that
+    blob, or (without hardlinks) already a copy of it.
+    """
+    h = put_blob(out_dir, content, h)
+    if is_linked(out_dir, h, path):
+        return False
+    w = writer or BatchWriter()
+    try:
+        w.stage_link(blob_path(out_dir, h), path)
+    except OSError:
+        if _blob_matches(path, content.encode("utf-8") if isinstance(content, str) else content):
+            return False
+        w.stage(path, content)
+    if writer is None:
+        w.publish()
+    return True
+
+
+def is_linked(out_dir, h, path):
+    # whether path is a hardlink to the blob for h (not a copy or a stale inode)
+    try:
+        return os.path.samefile(path, blob_path(out_dir, h))
+    except FileNotFoundError:
+        return False
+
+
+def flat_path(out_dir, day, key):
+    for k, prefix, suffix in CHANNELS:
+        if k == key:
+            return os.path.join(out_dir, f"{prefix}{day}{suffix}")
+    raise KeyError(key)
+
+
+def month_path(out_dir, day):
+    return os.path.join(out_dir, PACK_DIR, f"{day[:7]}.jsonl")
+
+
+def make_record(assets):
+    meta = assets["meta"]
+    # "date" first so readers can match a line without parsing it
+    return {
+        "date": meta["date"],
+        "theme": meta["theme"]["id"],
+        "primary_link": meta["primary_link"],
+        "primary_url": meta["primary_url"],
+        "channels": {key: assets[key] for key, _, _ in CHANNELS},
+    }
+
+
+def _dump(record):
+    return json.dumps(record, ensure_ascii=False)
+
+
+def load_month(path):
+    records = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    rec = json.loads(line)
+                    records[rec["date"]] = rec
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def _dedup_record(out_dir, rec):
+    # Swap channel texts for blob references
+    rec = dict(rec)
+    rec["blobs"] = {k: put_blob(out_dir, v) for k, v in rec.pop("channels").items()}
+    return rec
+
+
+def _record_hashes(rec):
+    if "blobs" in rec:
+        return rec["blobs"]
+    return {k: content_hash(v) for k, v in rec["channels"].items()}
+
+
+def record_channels(out_dir, rec):
+    """
+    {channel key: text} for a packed record, resolving blob references.
+    """
+    if "blobs" in rec:
+        return {k: get_blob(out_dir, h) for k, h in rec["blobs"].items()}
+    return rec["channels"]
+
+
+def write_packed(out_dir, assets_list, dedup=False, force=False):
+    """
+    Merges one record per day into the month files under output/packed/.
+    With dedup, records reference blobs instead of embedding the texts.
+    A month file is only rewritten (atomically) when one of its days changed,
+    or always with force. Returns {date: written} where written is the number
+    of channels that differ from what was stored before (all of them with
+    force).
+    """
+    by_month = {}
+    for assets in assets_list:
+        rec = make_record(assets)
+        if dedup:
+            rec = _dedup_record(out_dir, rec)
+        by_month.setdefault(rec["date"][:7], []).append(rec)
+
+    pack_dir = os.path.join(out_dir, PACK_DIR)
+    os.makedirs(pack_dir, exist_ok=True)
+
+    result = {}
+    for month, recs in by_month.items():
+        path = os.path.join(pack_dir, f"{month}.jsonl")
+        stored = load_month(path)
+        dirty = force
+        for rec in recs:
+            old = stored.get(rec["date"])
+            old_hashes = _record_hashes(old) if old and not force else {}
+            changed = sum(1 for k, h in _record_hashes(rec).items() if old_hashes.get(k) != h)
+            result[rec["date"]] = changed
+            if old != rec:
+                stored[rec["date"]] = rec
+                dirty = True
+        if dirty:
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for d in sorted(stored):
+                    f.write(_dump(stored[d]) + "\n")
+            os.replace(tmp, path)
+    return result
+
+
+def _read_packed(out_dir, day):
+    path = month_path(out_dir, day)
+    prefix = '{"date": "' + day + '"'
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(prefix):
+                    return json.loads(line)
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def read_day(out_dir, day):
+    """
+    Reader API: {channel key: text} for one day from whichever layout has it
+    (packed first, then flat files). Missing channels come back as "".
+    Returns None when the day exists in neither layout.
+    """
+    rec = _read_packed(out_dir, day)
+    if rec is not None:
+        channels = record_channels(out_dir, rec)
+        return {key: channels.get(key, "") for key, _, _ in CHANNELS}
+
+    blocks = {}
+    found = False
+    for key, prefix, suffix in CHANNELS:
+        try:
+            with open(os.path.join(out_dir, f"{prefix}{day}{suffix}"), "r", encoding="utf-8") as f:
+                blocks[key] = f.read()
+            found = True
+        except FileNotFoundError:
+            blocks[key] = ""
+    return blocks if found else None
+
+
+def iter_packed(out_dir, start=None, end=None):
+    """
+    Yields packed records in date order, one month file at a time.
+    """
+    pack_dir = os.path.join(out_dir, PACK_DIR)
+    if not os.path.isdir(pack_dir):
+        return
+    for fn in sorted(os.listdir(pack_dir)):
+        if not fn.endswith(".jsonl"):
+            continue
+        month = fn[:-len(".jsonl")]
+        if (start and month < start[:7]) or (end and month > end[:7]):
+            continue
+        for d, rec in sorted(load_month(os.path.join(pack_dir, fn)).items()):
+            if (start and d < start) or (end and d > end):
+                continue
+            yield rec
+
+
+def packed_days(out_dir):
+    """
+    (date, theme, channel keys, month file mtime) for every packed day —
+    what kr3w_index.rebuild() needs.
+    """
+    pack_dir = os.path.join(out_dir, PACK_DIR)
+    if not os.path.isdir(pack_dir):
+        return
+    for fn in sorted(os.listdir(pack_dir)):
+        if fn.endswith(".jsonl"):
+            path = os.path.join(pack_dir, fn)
+            mtime = os.path.getmtime(path)
+            for d, rec in sorted(load_month(path).items()):
+                yield d, rec.get("theme", ""), list(rec.get("channels") or rec["blobs"]), mtime
+
+
+def export_flat(out_dir, start=None, end=None):
+    """
+    Writes the legacy blog_<d>.md / ad_*_<d>.txt files for packed days.
+    Returns the number of days exported.
+    """
+    n = 0
+    with BatchWriter() as w:
+        for rec in iter_packed(out_dir, start, end):
+            channels = record_channels(out_dir, rec)
+            for key, prefix, suffix in CHANNELS:
+                w.stage(os.path.join(out_dir, f"{prefix}{rec['date']}{suffix}"), channels.get(key, ""))
+            w.publish()
+            n += 1
+    return n
+
+
+def dedup_stats(out_dir, manifest):
+    """
+    How much the (date, channel) entries in the manifest share content.
+    Sizes come from the blob store, or the flat file when there is no blob.
+    """
+    sizes = {}
+    refs = 0
+    logical = 0
+    for entry_key, entry in manifest.items():
+        h = entry.get("hash")
+        if not h:
+            continue
+        refs += 1
+        if h not in sizes:
+            d, key = entry_key.split("/", 1)
+            size = 0
+            for path in (blob_path(out_dir, h), flat_path(out_dir, d, key)):
+                try:
+                    size = os.path.getsize(path)
+                    break
+                except OSError:
+                    continue
+            sizes[h] = size
+        logical += sizes[h]
+
+    blob_files = 0
+    blob_root = os.path.join(out_dir, BLOB_DIR)
+    if os.path.isdir(blob_root):
+        for sub in os.listdir(blob_root):
+            blob_files += len(os.listdir(os.path.join(blob_root, sub)))
+
+    unique_bytes = sum(sizes.values())
+    return {
+        "entries": refs,
+        "unique": len(sizes),
+        "ratio": refs / len(sizes) if sizes else 1.0,
+        "logical_bytes": logical,
+        "unique_bytes": unique_bytes,
+        "blob_files": blob_files,
+    }
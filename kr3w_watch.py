@@ -0,0 +1,100 @@
+import os
+import time
+
+import kr3w_engine
+import kr3w_index
+
+# Which per-day draw fields and config-wide fields each channel's text uses
+# (see the renderers in kr3w_engine). Channels not listed are assumed to use
+# everything.
+CHANNEL_DEPS = {
+    "blog": ("hook", "label", "url"),
+    "ad_facebook": ("brand", "hook", "cta", "url", "tags"),
+    "ad_tiktok": ("hook", "cta", "url", "tags"),
+    "caption_short": ("hook", "url", "tags"),
+    "youtube": ("hook", "cta", "url", "tags"),
+    "sms_cta": ("brand", "sms_keyword", "url"),
+}
+ALL_FIELDS = ("theme", "label", "hook", "cta", "url", "brand", "sms_keyword", "tags")
+
+
+def config_stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def wait_for_change(path, stamp, interval=0.2):
+    """
+    Polls path until its (mtime, size) differs from stamp; returns the new
+    stamp. A file that is briefly missing (editors that save by rename)
+    just means "look again".
+    """
+    while True:
+        time.sleep(interval)
+        try:
+            new = config_stamp(path)
+        except OSError:
+            continue
+        if new != stamp:
+            return new
+
+
+def global_changes(old, new):
+    changed = set()
+    if (old.brand.name, old.brand.tagline) != (new.brand.name, new.brand.tagline):
+        changed.add("brand")
+    if old.brand.sms_keyword != new.brand.sms_keyword:
+        changed.add("sms_keyword")
+    if old.tag_str != new.tag_str:
+        changed.add("tags")
+    return changed
+
+
+def day_fields(cfg, day):
+    d = kr3w_engine.draw_day(cfg, day)
+    return d.theme.id, d.theme.label, d.hook, d.cta, d.primary_url
+
+
+def existing_days(out_dir, manifest, days):
+    """
+    {date: set of channel keys} for the days in `days` that were already
+    generated, going by the manifest and output/.index.sqlite. Watch only
+    rewrites these; it never starts new days.
+    """
+    wanted = {d.isoformat() for d in days}
+    found = {}
+    for entry in manifest:
+        d, _, key = entry.partition("/")
+        if d in wanted:
+            found.setdefault(d, set()).add(key)
+    if wanted:
+        for d, _, channels in kr3w_index.days_between(out_dir, min(wanted), max(wanted)):
+            found.setdefault(d, set()).update(channels)
+    return found
+
+
+def affected(old, new, days, channels):
+    """
+    [(day, [channel keys])] whose text differs between two compiled configs,
+    worked out from the per-day draws (theme, hook, CTA, URL) and the
+    config-wide fields each channel uses — nothing is rendered. Both
+    configs' schedules must already be registered with
+    kr3w_engine.use_schedule().
+    """
+    if old.fingerprint == new.fingerprint:
+        return []
+    glob = global_changes(old, new)
+    deps = {key: set(CHANNEL_DEPS.get(key, ALL_FIELDS)) for key in channels}
+    names = ("theme", "label", "hook", "cta", "url")
+    out = []
+    for day in days:
+        a, b = day_fields(old, day), day_fields(new, day)
+        changed = glob
+        if a != b:
+            changed = glob | {name for name, x, y in zip(names, a, b) if x != y}
+        if changed:
+            keys = [key for key in channels if deps[key] & changed]
+            # a new theme id alone changes no text, but the index records it
+            if keys or "theme" in changed:
+                out.append((day, keys))
+    return out
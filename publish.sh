@@ -6,16 +6,8 @@ cd "$HOME/kr3w"
 # Generate today's assets
 python3 kr3w.py
 
-# Commit + push if changes exist
-git add -A
-if git diff --cached --quiet; then
-  echo "No changes to commit."
-  exit 0
-fi
-
-MSG="Auto publish: $(date +%F)"
-git commit -m "$MSG"
-git push
+# Commit + push only the files kr3w.py wrote (no full-tree git add -A)
+python3 scripts/publish.py --push -m "Auto publish: $(date +%F)"
 
 echo "✅ Published to GitHub."
 echo "📁 Output: $HOME/kr3w/output"
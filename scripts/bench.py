@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+import tempfile
+import platform
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import kr3w  # noqa: E402
+import kr3w_index  # noqa: E402
+import kr3w_model  # noqa: E402
+from kr3w_store import CHANNELS, content_hash, load_manifest, save_manifest  # noqa: E402
+import build_dashboard  # noqa: E402
+from build_blog_post import build_blog_post  # noqa: E402
+
+HOME = os.path.expanduser("~")
+ROOT = os.path.join(HOME, "kr3w")
+BENCH_DIR = os.path.join(ROOT, "bench")
+
+BENCH_VERSION = 1
+BENCH_DAY = date(2026, 1, 1)
+
+# Fixture sizes: config = themes/hooks/links each, output = files in output/
+CONFIG_SIZES = (10, 1000, 10000)
+OUTPUT_SIZES = (1000, 10000, 100000)
+QUICK_CONFIG_SIZES = (10, 1000)
+QUICK_OUTPUT_SIZES = (1000, 10000)
+
+def synthetic_config(n):
+    """
+    A valid config with n links, n themes (each with its own hooks/CTAs) and
+    n top-level hooks/CTAs, rotated across the week.
+    """
+    links = {f"link{i}": f"https://example.com/{i}" for i in range(n)}
+    themes = [
+        {
+            "id": f"t{i}",
+            "label": f"Theme {i}",
+            "primary_link": f"link{i}",
+            "hooks": [f"Hook {i}.{j} for theme {i}" for j in range(3)],
+            "ctas": [f"CTA {i}.{j}" for j in range(3)],
+        }
+        for i in range(n)
+    ]
+    week = kr3w_model.WEEKDAYS
+    rotation = {dow: [f"t{i}" for i in range(k, n, len(week))][:50] for k, dow in enumerate(week)}
+    raw = {
+        "brand": {"name": "BenchBrand", "tagline": "Benchmarks all the way down."},
+        "links": links,
+        "themes": themes,
+        "weekly_rotation": {dow: ids for dow, ids in rotation.items() if ids},
+        "hooks": [f"Global hook number {i}" for i in range(n)],
+        "ctas": [f"Global CTA number {i}" for i in range(n)],
+        "hashtags": ["#Bench", "#Kr3w"],
+    }
+    return raw
+
+def synthetic_output(out_dir, n_files):
+    """
+    Fills out_dir with n_files legacy flat files (whole days first), with
+    staggered mtimes so "newest" is well defined, plus a manifest listing
+    them. Returns the day count.
+    """
+    days = max(1, n_files // len(CHANNELS))
+    start = date(2000, 1, 1)
+    written = 0
+    manifest = {}
+    for i in range(days):
+        d = (start + timedelta(days=i)).isoformat()
+        for key, prefix, suffix in CHANNELS:
+            if written >= n_files:
+                break
+            path = os.path.join(out_dir, f"{prefix}{d}{suffix}")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"{key} {d}\n")
+            os.utime(path, (1_000_000_000 + i, 1_000_000_000 + i))
+            manifest[f"{d}/{key}"] = {"hash": content_hash(f"{key} {d}\n"), "config": "bench"}
+            written += 1
+    save_manifest(out_dir, manifest)
+    return days
+
+def measure(fn, min_time=0.3, max_runs=5000):
+    """
+    Calls fn repeatedly for ~min_time seconds. Returns per-call latency
+    (median/p95/min in µs) plus peak traced allocation for one extra call
+    (tracemalloc is kept out of the timed runs).
+    """
+    fn()  # warm-up
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < max_runs and (len(samples) < 5 or time.perf_counter() < deadline):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = samples[len(samples) // 2]
+    return {
+        "runs": len(samples),
+        "median_us": round(median * 1e6, 2),
+        "p95_us": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1e6, 2),
+        "min_us": round(samples[0] * 1e6, 2),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+def bench_config(n, results, min_time):
+    raw = synthetic_config(n)
+    results[f"compile_config[cfg={n}]"] = measure(lambda: kr3w_model.compile_config(raw), min_time)
+    cfg = kr3w_model.compile_config(raw)
+
+    r = measure(lambda: kr3w.build_assets(cfg, BENCH_DAY), min_time)
+    r["days_per_sec"] = round(1e6 / r["median_us"], 1)
+    results[f"build_assets[cfg={n}]"] = r
+
+    now = datetime(2026, 1, 1, 9, 0)
+    results[f"build_blog_post[cfg={n}]"] = measure(lambda: build_blog_post(cfg, None, now), min_time)
+
+    assets = kr3w.build_assets(cfg, BENCH_DAY)
+    data = {
+        "date": BENCH_DAY.isoformat(),
+        "generated_at": "bench",
+        "brand_name": cfg.brand.name,
+        "links": dict(cfg.links.items()),
+        "blocks": {key: assets[key].strip() for key, _, _ in CHANNELS},
+    }
+    results[f"build_dashboard_html[cfg={n}]"] = measure(lambda: build_dashboard.build_dashboard_html(data), min_time)
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        results[f"write_assets[cfg={n}]"] = measure(lambda: kr3w.write_assets(out_dir, assets), min_time)
+        manifest = {}
+        kr3w.write_assets(out_dir, assets, manifest, cfg.fingerprint)
+        results[f"write_assets_unchanged[cfg={n}]"] = measure(
+            lambda: kr3w.write_assets(out_dir, assets, manifest, cfg.fingerprint), min_time)
+
+        # End-to-end: a year through generate_range (build + write + manifest)
+        days = [BENCH_DAY + timedelta(days=i) for i in range(365)]
+
+        def year():
+            for _ in kr3w.generate_range(cfg, out_dir, days, 1, {}, cfg.fingerprint, force=True):
+                pass
+        t0 = time.perf_counter()
+        year()
+        secs = time.perf_counter() - t0
+        tracemalloc.start()
+        year()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[f"generate_range[cfg={n},days=365]"] = {
+            "runs": 1,
+            "median_us": round(secs * 1e6, 2),
+            "days_per_sec": round(len(days) / secs, 1),
+            "peak_kb": round(peak / 1024, 1),
+        }
+
+def bench_output(n_files, results, min_time):
+    with tempfile.TemporaryDirectory() as out_dir:
+        synthetic_output(out_dir, n_files)
+        saved = build_dashboard.OUT_DIR
+        build_dashboard.OUT_DIR = out_dir
+        try:
+            # No index: the mtime scan fallback
+            results[f"latest_date_from_output[files={n_files},scan]"] = measure(
+                build_dashboard.latest_date_from_output, min_time, max_runs=200)
+            kr3w_index.rebuild(out_dir, CHANNELS)
+            results[f"latest_date_from_output[files={n_files},index]"] = measure(
+                build_dashboard.latest_date_from_output, min_time)
+        finally:
+            build_dashboard.OUT_DIR = saved
+        results[f"load_manifest[files={n_files}]"] = measure(lambda: load_manifest(out_dir), min_time, max_runs=200)
+
+def cmd_run(args):
+    config_sizes = args.config_sizes or (QUICK_CONFIG_SIZES if args.quick else CONFIG_SIZES)
+    output_sizes = args.output_sizes or (QUICK_OUTPUT_SIZES if args.quick else OUTPUT_SIZES)
+    results = {}
+    t0 = time.perf_counter()
+    for n in config_sizes:
+        print(f"⏱  config fixtures: {n} themes/hooks/links")
+        bench_config(n, results, args.min_time)
+    for n in output_sizes:
+        print(f"⏱  output fixtures: {n} files")
+        bench_output(n, results, args.min_time)
+
+    doc = {
+        "version": BENCH_VERSION,
+        "label": args.label,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+    print()
+    print_table(results)
+    print(f"\n✅ {len(results)} benchmark(s) in {time.perf_counter() - t0:.1f}s -> {args.output}")
+
+def print_table(results):
+    print(f"{'benchmark':<52} {'median':>12} {'p95':>12} {'peak':>10}  extra")
+    for name, r in results.items():
+        extra = f"{r['days_per_sec']} days/s" if "days_per_sec" in r else ""
+        p95 = f"{r['p95_us']:.1f} µs" if "p95_us" in r else "-"
+        print(f"{name:<52} {r['median_us']:>9.1f} µs {p95:>12} {r['peak_kb']:>7.1f} KB  {extra}")
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        doc = json.load(f)
+    if doc.get("version") != BENCH_VERSION:
+        raise SystemExit(f"❌ {path}: unsupported bench file version {doc.get('version')!r}")
+    return doc
+
+def compare(base, cur, threshold, mem_threshold):
+    """
+    [(name, metric, base value, current value, ratio)] for every benchmark
+    present in both runs whose latency or peak memory grew by more than the
+    threshold (0.10 = 10%).
+    """
+    regressions = []
+    for name, b in base["results"].items():
+        c = cur["results"].get(name)
+        if c is None:
+            continue
+        for metric, limit in (("median_us", threshold), ("peak_kb", mem_threshold)):
+            if b.get(metric) and c.get(metric) is not None:
+                ratio = c[metric] / b[metric]
+                if ratio > 1 + limit:
+                    regressions.append((name, metric, b[metric], c[metric], ratio))
+    return regressions
+
+def cmd_compare(args):
+    base = load_results(args.baseline)
+    cur = load_results(args.current)
+    print(f"Baseline: {args.baseline} ({base.get('label') or base['created']})")
+    print(f"Current:  {args.current} ({cur.get('label') or cur['created']})\n")
+
+    print(f"{'benchmark':<52} {'base':>12} {'current':>12} {'change':>8}")
+    for name, b in base["results"].items():
+        c = cur["results"].get(name)
+        if c is None:
+            print(f"{name:<52} {b['median_us']:>9.1f} µs {'(missing)':>12}")
+            continue
+        change = (c["median_us"] / b["median_us"] - 1) * 100 if b["median_us"] else 0.0
+        print(f"{name:<52} {b['median_us']:>9.1f} µs {c['median_us']:>9.1f} µs {change:>+7.1f}%")
+
+    regressions = compare(base, cur, args.threshold, args.mem_threshold)
+    print()
+    if not regressions:
+        print(f"✅ No regressions beyond {args.threshold:.0%} (latency) / {args.mem_threshold:.0%} (memory)")
+        return 0
+    print(f"❌ {len(regressions)} regression(s):")
+    for name, metric, b, c, ratio in regressions:
+        print(f"  {name}: {metric} {b} -> {c} ({(ratio - 1) * 100:+.1f}%)")
+    return 1
+
+def parse_sizes(s):
+    return tuple(int(x) for x in s.split(",") if x.strip())
+
+def main():
+    import argparse
+
+    p = argparse.ArgumentParser(description="Benchmarks for the generation, rendering and dashboard hot paths")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run the benchmarks and save a JSON result file")
+    run.add_argument("--quick", action="store_true", help="Skip the largest fixtures")
+    run.add_argument("--config-sizes", type=parse_sizes, help="e.g. 10,1000,10000")
+    run.add_argument("--output-sizes", type=parse_sizes, help="e.g. 1000,10000,100000")
+    run.add_argument("--min-time", type=float, default=0.3, help="Seconds spent timing each benchmark")
+    run.add_argument("--label", default="", help="Free-form name stored with the results")
+    run.add_argument("-o", "--output",
+                     help=f"Result file (default: {BENCH_DIR}/bench-<timestamp>.json)")
+
+    cmp_ = sub.add_parser("compare", help="Flag regressions between two result files")
+    cmp_.add_argument("baseline")
+    cmp_.add_argument("current")
+    cmp_.add_argument("--threshold", type=float, default=0.10, help="Allowed latency growth (default 0.10 = 10%%)")
+    cmp_.add_argument("--mem-threshold", type=float, default=0.25, help="Allowed peak memory growth (default 0.25)")
+
+    args = p.parse_args()
+    if args.command == "run":
+        args.output = args.output or os.path.join(BENCH_DIR, f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+        cmd_run(args)
+        return 0
+    return cmd_compare(args)
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
 import os
+import sys
 import json
+import time
+import hashlib
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from kr3w_model import ConfigError, load_config  # noqa: E402
+import kr3w_index  # noqa: E402
+import kr3w_store  # noqa: E402
+
 HOME = os.path.expanduser("~")
 ROOT = os.path.join(HOME, "kr3w")
 OUT_DIR = os.path.join(ROOT, "output")
@@ -17,15 +25,19 @@ FILES = [
     ("sms_cta", "sms_cta_", ".txt"),
 ]
 
-def read_text(path):
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read().strip()
-    except FileNotFoundError:
-        return ""
+# Compact sidecar for scripts/dashboard.py: header fields, precomputed
+# previews, and where each block's JSON string sits inside dashboard.json
+PREVIEW_NAME = "dashboard.preview.json"
+PREVIEW_VERSION = 1
+PREVIEW_CHARS = 120
 
 def latest_date_from_output():
-    # Find the newest youtube_YYYY-MM-DD.txt or caption_short_YYYY-MM-DD.txt and extract date
+    # Fast path: kr3w.py keeps output/.index.sqlite up to date
+    day = kr3w_index.latest_day(OUT_DIR)
+    if day:
+        return day
+
+    # No index yet (older output/): find the newest youtube_YYYY-MM-DD.txt or caption_short_YYYY-MM-DD.txt and extract date
     candidates = []
     if not os.path.isdir(OUT_DIR):
         return None
@@ -45,12 +57,15 @@ def latest_date_from_output():
     candidates.sort(reverse=True)
     return candidates[0][1]
 
-def load_cfg():
-    try:
-        with open(CFG_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {}
+# Dashboard card order
+BLOCK_TITLES = [
+    ("Short Caption", "caption_short"),
+    ("TikTok Ad", "ad_tiktok"),
+    ("Facebook Ad", "ad_facebook"),
+    ("YouTube Description", "youtube"),
+    ("SMS/DM CTA", "sms_cta"),
+    ("Blog (Markdown)", "blog"),
+]
 
 def html_escape(s: str) -> str:
     return (s.replace("&", "&amp;")
@@ -59,7 +74,18 @@ def html_escape(s: str) -> str:
              .replace('"', "&quot;")
              .replace("'", "&#39;"))
 
+def text_escape(s: str) -> str:
+    # Text nodes (e.g. <pre>) only need &, < and > escaped
+    return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
 def build_dashboard_html(data):
+    return "".join(iter_dashboard_html(data))
+
+def iter_dashboard_html(data):
+    """
+    Yields the dashboard page in chunks (head, one per block, tail) so it
+    can be streamed straight into the file and its compressed siblings.
+    """
     brand = data.get("brand_name", "Sinist3rKr3w")
     day = data.get("date", "")
     links = data.get("links", {})
@@ -70,20 +96,25 @@ def build_dashboard_html(data):
             return ""
         return f'<li><a href="{html_escape(url)}" target="_blank" rel="noopener noreferrer">{html_escape(label)}</a></li>'
 
+    nav = data.get("nav") or []
+    nav_html = " • ".join(f'<a href="{html_escape(href)}">{html_escape(label)}</a>' for label, href in nav if href)
+    foot = (f'<div class="foot">{nav_html}</div>' if nav else
+            '<div class="foot">Tip: open this file anytime: <code>~/kr3w/output/dashboard.html</code></div>')
+
     def block_section(title, content):
         if not content:
             content = "(missing)"
+        # Payload is emitted once; the Copy button reads it back from <pre>
         return f"""
-        <section class="card">
-          <div class="card-head">
-            <h2>{html_escape(title)}</h2>
-            <button class="copy" data-copy="{html_escape(content)}">Copy</button>
-          </div>
-          <pre>{html_escape(content)}</pre>
-        </section>
-        """
+      <section class="card">
+        <div class="card-head">
+          <h2>{html_escape(title)}</h2>
+          <button class="copy">Copy</button>
+        </div>
+        <pre>{text_escape(content)}</pre>
+      </section>"""
 
-    return f"""<!doctype html>
+    yield f"""<!doctype html>
 <html lang="en">
 <head>
   <meta charset="utf-8" />
@@ -129,22 +160,22 @@ def build_dashboard_html(data):
       </div>
     </div>
 
-    <div class="grid">
-      {block_section("Short Caption", blocks.get("caption_short",""))}
-      {block_section("TikTok Ad", blocks.get("ad_tiktok",""))}
-      {block_section("Facebook Ad", blocks.get("ad_facebook",""))}
-      {block_section("YouTube Description", blocks.get("youtube",""))}
-      {block_section("SMS/DM CTA", blocks.get("sms_cta",""))}
-      {block_section("Blog (Markdown)", blocks.get("blog",""))}
+    <div class="grid">"""
+
+    for title, key in BLOCK_TITLES:
+        yield block_section(title, blocks.get(key, ""))
+
+    yield f"""
     </div>
 
-    <div class="foot">Tip: open this file anytime: <code>~/kr3w/output/dashboard.html</code></div>
+    {foot}
   </div>
 
 <script>
   document.querySelectorAll(".copy").forEach(btn => {{
     btn.addEventListener("click", async () => {{
-      const text = btn.getAttribute("data-copy") || "";
+      const pre = btn.closest(".card").querySelector("pre");
+      const text = pre ? pre.textContent : "";
       try {{
         await navigator.clipboard.writeText(text);
         const old = btn.textContent;
@@ -160,7 +191,294 @@ def build_dashboard_html(data):
 </html>
 """
 
+def write_html(path, chunks):
+    """
+    Streams chunks into path plus path.gz (and path.br when the optional
+    brotli module is installed), each via a temp file + rename.
+    Returns {extension: bytes written}.
+    """
+    import gzip
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    raw_tmp, gz_tmp, br_tmp = path + ".tmp", path + ".gz.tmp", path + ".br.tmp"
+    sizes = {"html": 0}
+    with open(raw_tmp, "wb") as raw, open(gz_tmp, "wb") as gz_file:
+        # mtime=0 keeps the .gz byte-identical for identical pages
+        gz = gzip.GzipFile(fileobj=gz_file, mode="wb", compresslevel=9, mtime=0)
+        br_file = open(br_tmp, "wb") if brotli else None
+        br = brotli.Compressor(quality=11) if brotli else None
+        try:
+            for chunk in chunks:
+                b = chunk.encode("utf-8")
+                raw.write(b)
+                gz.write(b)
+                if br:
+                    br_file.write(br.process(b))
+                sizes["html"] += len(b)
+            gz.close()
+            if br:
+                br_file.write(br.finish())
+        finally:
+            if br_file:
+                br_file.close()
+
+    os.replace(raw_tmp, path)
+    os.replace(gz_tmp, path + ".gz")
+    sizes["gz"] = os.path.getsize(path + ".gz")
+    if brotli:
+        os.replace(br_tmp, path + ".br")
+        sizes["br"] = os.path.getsize(path + ".br")
+    return sizes
+
+def legacy_size(html_bytes, blocks):
+    # What the old layout cost: every block also sat in a data-copy="..." attribute
+    extra = 0
+    for _, key in BLOCK_TITLES:
+        content = blocks.get(key, "") or "(missing)"
+        extra += len(f' data-copy="{html_escape(content)}"'.encode("utf-8"))
+        extra += len(html_escape(content).encode("utf-8")) - len(text_escape(content).encode("utf-8"))
+    return html_bytes + extra
+
+# --- History mode: output/site/ with one page per day + paginated indexes ---
+
+SITE_DIR = os.path.join(OUT_DIR, "site")
+SITE_STATE = os.path.join(SITE_DIR, ".state.json")
+PAGE_SIZE = 50
+
+def content_hash(*parts):
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(p.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+def template_hash():
+    # Any edit to this script (templates included) invalidates every page
+    with open(os.path.abspath(__file__), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def list_days():
+    """
+    [(date, theme)] for every day on disk (flat files + packed store),
+    oldest first. The index only knows days kr3w.py generated since it
+    existed, so it supplies themes but never limits the list.
+    """
+    found = {}
+    for fn in os.listdir(OUT_DIR):
+        for key, prefix, suffix in FILES:
+            if fn.startswith(prefix) and fn.endswith(suffix):
+                date_part = fn[len(prefix):-len(suffix)]
+                if len(date_part) == 10 and date_part[4] == "-" and date_part[7] == "-":
+                    found.setdefault(date_part, "")
+    for d, theme, _, _ in kr3w_store.packed_days(OUT_DIR):
+        found[d] = theme
+    for d, theme, _ in kr3w_index.days_between(OUT_DIR, "0000-00-00", "9999-99-99"):
+        if d in found and theme:
+            found[d] = theme
+    return sorted(found.items())
+
+def day_source_hash(day, site_key):
+    """
+    Hash of everything a day page shows. Flat files are keyed by their size
+    and mtime, so edits made outside kr3w.py (build_blog_post.py,
+    daily_run.sh) are picked up without reading them; days in a packed
+    month file are keyed by their texts.
+    """
+    if os.path.exists(kr3w_store.month_path(OUT_DIR, day)):
+        blocks = kr3w_store.read_day(OUT_DIR, day) or {}
+        return content_hash(site_key, day, *(content_hash(blocks.get(key, "")) for key, _, _ in FILES))
+    parts = []
+    for key, prefix, suffix in FILES:
+        try:
+            st = os.stat(os.path.join(OUT_DIR, f"{prefix}{day}{suffix}"))
+            parts.append(f"{st.st_size}:{st.st_mtime_ns}")
+        except FileNotFoundError:
+            parts.append("-")
+    return content_hash(site_key, day, *parts)
+
+def page_name(n, pages):
+    # Pages are fixed PAGE_SIZE chunks counted from the oldest day, so a new
+    # day only changes the newest page; index.html is always the newest.
+    return "index.html" if n == pages else f"page-{n}.html"
+
+def build_index_html(brand, page, pages, rows):
+    def page_href(n):
+        return page_name(n, pages)
+
+    items = "\n".join(
+        f'<li><a href="days/{d}.html">{html_escape(d)}</a> <span class="theme">{html_escape(theme)}</span></li>'
+        for d, theme in rows
+    )
+    pager = " ".join(
+        f"<strong>{n}</strong>" if n == page else f'<a href="{page_href(n)}">{n}</a>'
+        for n in range(pages, 0, -1)
+    )
+    return f"""<!doctype html>
+<html lang="en">
+<head>
+  <meta charset="utf-8" />
+  <meta name="viewport" content="width=device-width,initial-scale=1" />
+  <title>{html_escape(brand)} Archive — page {page}</title>
+  <style>
+    body {{ font-family: system-ui, -apple-system, Segoe UI, Roboto, Arial, sans-serif; margin: 0; background: #0b0b0b; color: #f2f2f2; }}
+    .wrap {{ max-width: 980px; margin: 0 auto; padding: 18px; }}
+    h1 {{ margin:0 0 12px 0; font-size: 20px; }}
+    ul {{ background:#141414; border:1px solid #222; border-radius: 14px; padding: 12px 12px 12px 30px; }}
+    li {{ margin: 4px 0; }}
+    a {{ color: #7dd3fc; text-decoration:none; }}
+    a:hover {{ text-decoration:underline; }}
+    .theme {{ opacity:.7; font-size: 12px; margin-left: 6px; }}
+    .pager {{ opacity:.8; font-size: 13px; }}
+  </style>
+</head>
+<body>
+  <div class="wrap">
+    <h1>{html_escape(brand)} — Archive</h1>
+    <div class="pager">Pages: {pager}</div>
+    <ul>
+{items}
+    </ul>
+    <div class="pager">Pages: {pager}</div>
+  </div>
+</body>
+</html>
+"""
+
+def build_history(cfg):
+    """
+    Renders output/site/days/<date>.html for every day plus index pages.
+    Pages whose source hash (content + template + brand/links) is unchanged
+    since the last build are left alone.
+    """
+    t0 = time.perf_counter()
+    days_dir = os.path.join(SITE_DIR, "days")
+    os.makedirs(days_dir, exist_ok=True)
+
+    try:
+        with open(SITE_STATE, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        state = {}
+    old_days = state.get("days", {})
+    old_pages = state.get("pages", {})
+
+    brand_name = cfg.brand.name
+    links = dict(cfg.links.items())
+    site_key = content_hash(template_hash(), brand_name, json.dumps(links, sort_keys=True))
+
+    days = list_days()
+    rendered = unchanged = 0
+    new_days = {}
+    for i, (day, theme) in enumerate(days):
+        h = day_source_hash(day, site_key)
+        # neighbours are part of the page (prev/next links)
+        prev_day = days[i - 1][0] if i > 0 else ""
+        next_day = days[i + 1][0] if i + 1 < len(days) else ""
+        h = content_hash(h, prev_day, next_day)
+        new_days[day] = h
+        path = os.path.join(days_dir, f"{day}.html")
+        if old_days.get(day) == h and os.path.exists(path):
+            unchanged += 1
+            continue
+
+        day_blocks = kr3w_store.read_day(OUT_DIR, day) or {}
+        data = {
+            "date": day,
+            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "brand_name": brand_name,
+            "links": links,
+            "blocks": {key: day_blocks.get(key, "").strip() for key, _, _ in FILES},
+            "nav": [
+                ("← " + prev_day, f"{prev_day}.html" if prev_day else ""),
+                ("Archive", "../index.html"),
+                (next_day + " →", f"{next_day}.html" if next_day else ""),
+            ],
+        }
+        kr3w_store.write_text(path, build_dashboard_html(data))
+        rendered += 1
+
+    for day in old_days.keys() - new_days.keys():
+        try:
+            os.remove(os.path.join(days_dir, f"{day}.html"))
+        except FileNotFoundError:
+            pass
+
+    pages = max(1, -(-len(days) // PAGE_SIZE))
+    new_pages = {}
+    for page in range(1, pages + 1):
+        rows = days[(page - 1) * PAGE_SIZE:page * PAGE_SIZE][::-1]
+        name = page_name(page, pages)
+        h = content_hash(site_key, str(page), str(pages), json.dumps(rows))
+        new_pages[name] = h
+        path = os.path.join(SITE_DIR, name)
+        if old_pages.get(name) == h and os.path.exists(path):
+            continue
+        kr3w_store.write_text(path, build_index_html(brand_name, page, pages, rows))
+        rendered += 1
+    for name in old_pages.keys() - new_pages.keys():
+        try:
+            os.remove(os.path.join(SITE_DIR, name))
+        except FileNotFoundError:
+            pass
+
+    kr3w_store.write_text(SITE_STATE, json.dumps({"days": new_days, "pages": new_pages}, sort_keys=True))
+
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"✅ Site built: {os.path.join(SITE_DIR, 'index.html')}")
+    print(f"   {len(days)} day(s), {pages} index page(s): {rendered} rendered, {unchanged} unchanged ({ms:.0f} ms)")
+
+def preview_text(text, n=PREVIEW_CHARS):
+    t = (text or "").replace("\n", " ").strip()
+    return (t[:n] + "…") if len(t) > n else t
+
+def block_offsets(payload, blocks):
+    """
+    {key: [offset, length]} of each block's JSON-encoded string inside the
+    serialized payload. json.dumps escapes non-ASCII, so character offsets
+    are byte offsets.
+    """
+    offsets = {}
+    pos = payload.index('"blocks": {')
+    for key, value in blocks.items():
+        prefix = json.dumps(key) + ": "
+        encoded = json.dumps(value)
+        start = payload.index(prefix + encoded, pos) + len(prefix)
+        offsets[key] = [start, len(encoded)]
+        pos = start + len(encoded)
+    return offsets
+
+def write_dashboard_json(out_dir, data):
+    """
+    Writes dashboard.json, then its preview sidecar stamped with the
+    payload's (mtime_ns, size) so a stale sidecar is never trusted.
+    """
+    path = os.path.join(out_dir, "dashboard.json")
+    payload = json.dumps(data, indent=2)
+    kr3w_store.write_text(path, payload)
+    st = os.stat(path)
+    sidecar = {
+        "version": PREVIEW_VERSION,
+        "stamp": [st.st_mtime_ns, st.st_size],
+        "date": data["date"],
+        "generated_at": data["generated_at"],
+        "brand_name": data["brand_name"],
+        "links": data["links"],
+        "previews": {key: preview_text(text) for key, text in data["blocks"].items()},
+        "offsets": block_offsets(payload, data["blocks"]),
+    }
+    kr3w_store.write_text(os.path.join(out_dir, PREVIEW_NAME), json.dumps(sidecar, indent=1))
+
 def main():
+    import argparse
+
+    p = argparse.ArgumentParser()
+    p.add_argument("--history", action="store_true",
+                   help="Also (re)build the multi-day archive in output/site/")
+    args = p.parse_args()
+
     os.makedirs(OUT_DIR, exist_ok=True)
 
     day = latest_date_from_output()
@@ -168,18 +486,19 @@ def main():
         print("No output files found yet. Run: python3 kr3w.py")
         return
 
-    cfg = load_cfg()
-    brand = cfg.get("brand", {})
-    if isinstance(brand, str):
-        brand_name = brand
-    else:
-        brand_name = brand.get("name", "Sinist3rKr3w")
-
-    links = cfg.get("links", {}) if isinstance(cfg.get("links", {}), dict) else {}
+    try:
+        cfg = load_config(CFG_PATH)
+    except ConfigError as e:
+        print(f"❌ Bad config: {e}")
+        raise SystemExit(1)
+    brand_name = cfg.brand.name
+    links = dict(cfg.links.items())
 
+    # reader API: works for both the flat files and output/packed/
+    day_blocks = kr3w_store.read_day(OUT_DIR, day) or {}
     blocks = {}
     for key, prefix, suffix in FILES:
-        blocks[key] = read_text(os.path.join(OUT_DIR, f"{prefix}{day}{suffix}"))
+        blocks[key] = day_blocks.get(key, "").strip()
 
     data = {
         "date": day,
@@ -189,16 +508,21 @@ def main():
         "blocks": blocks,
     }
 
-    # write JSON snapshot (nice for debugging)
-    with open(os.path.join(OUT_DIR, "dashboard.json"), "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    # write JSON snapshot (nice for debugging) + the preview sidecar scripts/dashboard.py reads
+    write_dashboard_json(OUT_DIR, data)
 
-    # write HTML dashboard
-    html = build_dashboard_html(data)
-    with open(os.path.join(OUT_DIR, "dashboard.html"), "w", encoding="utf-8") as f:
-        f.write(html)
+    # write HTML dashboard (+ .gz/.br siblings)
+    sizes = write_html(os.path.join(OUT_DIR, "dashboard.html"), iter_dashboard_html(data))
 
     print(f"✅ Dashboard built: {os.path.join(OUT_DIR, 'dashboard.html')}")
+    before = legacy_size(sizes["html"], blocks)
+    report = f"   Size: ~{before} B before (data-copy layout) -> {sizes['html']} B html, {sizes['gz']} B gz"
+    if "br" in sizes:
+        report += f", {sizes['br']} B br"
+    print(report)
+
+    if args.history:
+        build_history(cfg)
 
 if __name__ == "__main__":
     main()
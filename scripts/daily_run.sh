@@ -10,7 +10,9 @@ DATE=$(date +%Y-%m-%d)
 
 echo "=== KR3W RUN $DATE ===" >> "$LOG/run.log"
 
-python "$BASE/kr3w.py" > "$OUT/blog_$DATE.md"
+# write beside the target and rename: blog_<day>.md may be a hardlink into output/blobs/
+TMP="$OUT/.blog_$DATE.md.$$.tmp"
+python "$BASE/kr3w.py" > "$TMP" && mv -f "$TMP" "$OUT/blog_$DATE.md"
 
 echo "Generated: blog_$DATE.md" >> "$LOG/run.log"
 echo "=== DONE ===" >> "$LOG/run.log"
@@ -1,23 +1,84 @@
 #!/usr/bin/env python3
 import os
+import sys
 import json
+import mmap
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import kr3w_index  # noqa: E402
+import kr3w_store  # noqa: E402
+from build_dashboard import PREVIEW_NAME, PREVIEW_VERSION, preview_text  # noqa: E402
 
 HOME = os.path.expanduser("~")
 ROOT = os.path.join(HOME, "kr3w")
 OUT_DIR = os.path.join(ROOT, "output")
 DASH_JSON = os.path.join(OUT_DIR, "dashboard.json")
 DASH_HTML = os.path.join(OUT_DIR, "dashboard.html")
+DASH_PREVIEW = os.path.join(OUT_DIR, PREVIEW_NAME)
+
+def load_preview():
+    """
+    The sidecar build_dashboard.py writes next to dashboard.json, or None
+    when it is missing or was written for a different dashboard.json.
+    """
+    try:
+        with open(DASH_PREVIEW, "r", encoding="utf-8") as f:
+            side = json.load(f)
+        st = os.stat(DASH_JSON)
+    except (OSError, ValueError):
+        return None
+    if side.get("version") != PREVIEW_VERSION or side.get("stamp") != [st.st_mtime_ns, st.st_size]:
+        return None
+    return side
+
+def read_block(side, key):
+    # map dashboard.json and decode only this block's JSON string
+    offset, length = side["offsets"][key]
+    with open(DASH_JSON, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        return json.loads(m[offset:offset + length])
+
+def load_latest_day():
+    # No dashboard.json yet: read the latest day straight from the output store
+    day = kr3w_index.latest_day(OUT_DIR)
+    blocks = kr3w_store.read_day(OUT_DIR, day) if day else None
+    if blocks is None:
+        return None
+    return {"date": day, "blocks": blocks}
 
 def main():
-    if not os.path.exists(DASH_JSON):
-        print("❌ dashboard.json not found.")
-        print("Run these:")
-        print("  python3 kr3w.py")
-        print("  python3 scripts/build_dashboard.py")
-        return
+    import argparse
+
+    p = argparse.ArgumentParser()
+    p.add_argument("--full", metavar="BLOCK", help="Print one block in full (e.g. blog) instead of the previews")
+    args = p.parse_args()
 
-    with open(DASH_JSON, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    # Fast path: the sidecar holds everything the terminal view prints
+    data = load_preview()
+    if data is None:
+        if os.path.exists(DASH_JSON):
+            with open(DASH_JSON, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        else:
+            data = load_latest_day()
+            if data is None:
+                print("❌ dashboard.json not found.")
+                print("Run these:")
+                print("  python3 kr3w.py")
+                print("  python3 scripts/build_dashboard.py")
+                return
+        blocks = data.get("blocks", {})
+        data["previews"] = {key: preview_text(text) for key, text in blocks.items()}
+
+    if args.full:
+        if "offsets" in data and args.full in data["offsets"]:
+            text = read_block(data, args.full)
+        else:
+            text = data.get("blocks", {}).get(args.full)
+        if text is None:
+            print(f"❌ No block {args.full!r} (have: {', '.join(data['previews'])})")
+            return 1
+        print(text)
+        return
 
     print("\n📊 KR3W DASHBOARD")
     print("────────────────────────────")
@@ -32,10 +93,9 @@ def main():
         if v:
             print(f"  - {k}: {v}")
 
-    blocks = data.get("blocks", {})
-    def preview(key, n=120):
-        t = (blocks.get(key,"") or "").replace("\n", " ").strip()
-        return (t[:n] + "…") if len(t) > n else t
+    previews = data["previews"]
+    def preview(key):
+        return previews.get(key, "")
 
     print("\n🧾 Previews")
     print(f"  Short caption: {preview('caption_short')}")
@@ -47,7 +107,16 @@ def main():
 
     print("\n📁 Files")
     print(f"  HTML: {DASH_HTML}")
-    print(f"  JSON: {DASH_JSON}\n")
+    print(f"  JSON: {DASH_JSON}")
+    print("  Full text: python3 scripts/dashboard.py --full blog\n")
 
 if __name__ == "__main__":
-    main()
+    try:
+        code = main()
+        # flush here so a reader that went away (--full blog | head) is caught below
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # like any CLI filter: stop quietly instead of printing a traceback
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        code = 1
+    sys.exit(code)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import subprocess
+from datetime import date
+
+HOME = os.path.expanduser("~")
+ROOT = os.path.join(HOME, "kr3w")
+
+# Written by kr3w.py: one repo-relative path per line, appended every run
+PENDING_NAME = os.path.join("logs", "publish.pending")
+
+# Scratch index, so the user's own staged changes are never swept into the commit
+PUBLISH_INDEX = "kr3w-publish.index"
+
+def git(repo, *args, stdin=None, env=None, check=True):
+    p = subprocess.run(["git", "-C", repo, *args], input=stdin, capture_output=True, env=env)
+    if check and p.returncode != 0:
+        raise SystemExit(f"❌ git {' '.join(args)} failed:\n{p.stderr.decode('utf-8', 'replace').strip()}")
+    return p.stdout.decode("utf-8", "replace").strip()
+
+def read_pending(repo):
+    try:
+        with open(os.path.join(repo, PENDING_NAME), "r", encoding="utf-8") as f:
+            return list(dict.fromkeys(line.strip() for line in f if line.strip()))
+    except FileNotFoundError:
+        return []
+
+def clear_pending(repo, published):
+    # Keep anything kr3w.py appended while we were committing
+    path = os.path.join(repo, PENDING_NAME)
+    left = [p for p in read_pending(repo) if p not in published]
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("".join(p + "\n" for p in left))
+    os.replace(tmp, path)
+
+def commit_paths(repo, paths, message):
+    """
+    Commits exactly `paths` (added, modified or deleted) on top of HEAD
+    with git plumbing: read-tree HEAD into a scratch index, update-index
+    the paths, write-tree, commit-tree, update-ref. Nothing else in the
+    work tree is scanned. Returns (commit id or None, timings).
+    """
+    t = {}
+    t0 = time.perf_counter()
+    git_dir = git(repo, "rev-parse", "--absolute-git-dir")
+    head = git(repo, "rev-parse", "--verify", "-q", "HEAD", check=False) or None
+    env = dict(os.environ, GIT_INDEX_FILE=os.path.join(git_dir, PUBLISH_INDEX))
+    try:
+        if head:
+            git(repo, "read-tree", head, env=env)
+        else:
+            git(repo, "read-tree", "--empty", env=env)
+        t["read-tree"] = time.perf_counter() - t0
+
+        # --remove: a listed path that no longer exists is deleted from the tree
+        stdin = b"".join(p.encode("utf-8") + b"\0" for p in paths)
+        git(repo, "update-index", "--add", "--remove", "-z", "--stdin", stdin=stdin, env=env)
+        t["update-index"] = time.perf_counter() - t0 - sum(t.values())
+
+        tree = git(repo, "write-tree", env=env)
+        if head and tree == git(repo, "rev-parse", head + "^{tree}"):
+            return None, t
+        args = ["commit-tree", tree, "-m", message] + (["-p", head] if head else [])
+        commit = git(repo, *args)
+        git(repo, "update-ref", "-m", f"publish: {message}", "HEAD", commit, head or "0" * 40)
+        t["commit"] = time.perf_counter() - t0 - sum(t.values())
+    finally:
+        try:
+            os.remove(env["GIT_INDEX_FILE"])
+        except FileNotFoundError:
+            pass
+
+    # Bring the real index in line for just these paths (no full status)
+    t1 = time.perf_counter()
+    git(repo, "update-index", "--add", "--remove", "-z", "--stdin", stdin=stdin)
+    t["sync index"] = time.perf_counter() - t1
+    return commit, t
+
+def legacy_timing(repo):
+    """
+    What publish.sh / run_daily.sh spend finding changes, measured
+    read-only: git status --porcelain plus git add -A --dry-run.
+    """
+    t0 = time.perf_counter()
+    git(repo, "status", "--porcelain")
+    git(repo, "add", "-A", "--dry-run")
+    return time.perf_counter() - t0
+
+def main():
+    import argparse
+
+    p = argparse.ArgumentParser(description="Commit exactly the files kr3w.py wrote since the last publish")
+    p.add_argument("paths", nargs="*", help="Extra repo-relative paths to include")
+    p.add_argument("--repo", default=ROOT, help=f"Repository (default: {ROOT})")
+    p.add_argument("-m", "--message", help="Commit message (default: 'Auto publish: <date>')")
+    p.add_argument("--push", action="store_true", help="Push the commit afterwards")
+    p.add_argument("--remote", default="origin", help="Push target: remote name or URL/path (default origin)")
+    p.add_argument("--compare", action="store_true",
+                   help="Also time the git status / git add -A scan the shell scripts do")
+    args = p.parse_args()
+
+    repo = os.path.abspath(args.repo)
+    paths = list(dict.fromkeys(read_pending(repo) + args.paths))
+    if not paths:
+        print("No changes to commit.")
+        return 0
+
+    t0 = time.perf_counter()
+    message = args.message or f"Auto publish: {date.today().isoformat()}"
+    commit, timings = commit_paths(repo, paths, message)
+    elapsed = time.perf_counter() - t0
+    clear_pending(repo, set(paths))
+    if commit is None:
+        print(f"No changes to commit ({len(paths)} path(s) already match HEAD).")
+    else:
+        print(f"✅ Committed {commit[:10]}: {len(paths)} path(s) in {elapsed * 1000:.0f} ms")
+        print("   " + ", ".join(f"{k} {v * 1000:.0f} ms" for k, v in timings.items()))
+
+    if args.compare:
+        legacy = legacy_timing(repo)
+        print(f"⏱  Full-tree scan (git status + git add -A): {legacy * 1000:.0f} ms "
+              f"vs {elapsed * 1000:.0f} ms for this publish")
+
+    if args.push and commit is not None:
+        branch = git(repo, "symbolic-ref", "--short", "HEAD")
+        t1 = time.perf_counter()
+        git(repo, "push", args.remote, f"HEAD:refs/heads/{branch}")
+        print(f"🚀 Pushed {branch} to {args.remote} ({(time.perf_counter() - t1) * 1000:.0f} ms)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
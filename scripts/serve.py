@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import gzip
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import kr3w  # noqa: E402
+import kr3w_engine  # noqa: E402
+import kr3w_model  # noqa: E402
+import kr3w_schedule  # noqa: E402
+from build_dashboard import CFG_PATH, FILES, OUT_DIR, build_dashboard_html, latest_date_from_output  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Days rendered on demand are kept in memory, keyed by (date, config fingerprint)
+DEFAULT_CACHE_DAYS = 256
+
+# Re-stat kr3w_config.json at most this often (seconds)
+CONFIG_CHECK_EVERY = 1.0
+
+class Body:
+    """
+    One response body, compressed once when it is rendered.
+    """
+    __slots__ = ("type", "raw", "gz", "br", "etag")
+
+    def __init__(self, content_type, text):
+        self.type = content_type
+        self.raw = text.encode("utf-8")
+        self.gz = gzip.compress(self.raw, compresslevel=6, mtime=0)
+        self.br = brotli.compress(self.raw, quality=5) if brotli else None
+        self.etag = '"' + hashlib.sha256(self.raw).hexdigest()[:20] + '"'
+
+class DayCache:
+    """
+    Bounded LRU of rendered days: (date, fingerprint) -> {resource: Body}.
+    Concurrent misses for the same key share one render.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.pending = {}
+        self.hits = self.misses = self.joined = self.evictions = 0
+
+    async def get(self, key, render):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        fut = self.pending.get(key)
+        if fut is not None:
+            self.joined += 1
+            return await fut
+
+        self.misses += 1
+        fut = asyncio.get_running_loop().create_future()
+        self.pending[key] = fut
+        try:
+            entry = await render()
+        except Exception as e:
+            fut.set_exception(e)
+            # nobody else may be waiting; don't let the loop warn about it
+            fut.exception()
+            raise
+        finally:
+            del self.pending[key]
+        fut.set_result(entry)
+        self.entries[key] = entry
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.joined
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "joined": self.joined,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.joined) / lookups, 4) if lookups else 0.0,
+            "entries": len(self.entries),
+            "capacity": self.capacity,
+        }
+
+class Renderer:
+    """
+    Owns the compiled config (reloaded when kr3w_config.json changes) and
+    renders a day's pages. Renders run on a single worker thread so the
+    event loop keeps answering cache hits and 304s meanwhile.
+    """
+    def __init__(self, cfg_path):
+        self.cfg_path = cfg_path
+        self.cfg = None
+        self.stamp = None
+        self.checked = 0.0
+        self.schedule = None
+        self.pool = ThreadPoolExecutor(max_workers=1)
+        self.refresh()
+
+    def refresh(self):
+        now = time.monotonic()
+        if self.cfg is not None and now - self.checked < CONFIG_CHECK_EVERY:
+            return self.cfg
+        self.checked = now
+        try:
+            st = os.stat(self.cfg_path)
+        except OSError:
+            return self.cfg
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp != self.stamp:
+            try:
+                self.cfg = kr3w_model.load_config(self.cfg_path)
+            except kr3w_model.ConfigError as e:
+                print(f"❌ Bad config, keeping the previous one: {e}")
+                if self.cfg is None:
+                    raise
+            self.stamp = stamp
+        return self.cfg
+
+    def _use_schedule(self, cfg, day):
+        # Only no-repeat mode needs the compiled table for correct output;
+        # otherwise the engine applies the rotation rule directly.
+        if not cfg.no_repeat_days:
+            return
+        s = self.schedule
+        if s is None or s.fingerprint != cfg.fingerprint or not s.covers(day, day):
+            s = kr3w_schedule.load_schedule(cfg, self.cfg_path, day, day, cfg.no_repeat_days)
+            kr3w_engine.use_schedule(s)
+            self.schedule = s
+
+    def render(self, cfg, day):
+        self._use_schedule(cfg, day)
+        assets = kr3w.build_assets(cfg, day)
+        prev_day = (day - timedelta(days=1)).isoformat()
+        next_day = (day + timedelta(days=1)).isoformat()
+        data = {
+            "date": day.isoformat(),
+            "generated_at": f"on demand (config {cfg.fingerprint})",
+            "brand_name": cfg.brand.name,
+            "links": dict(cfg.links.items()),
+            "blocks": {key: assets[key].strip() for key, _, _ in FILES},
+            "nav": [
+                ("← " + prev_day, f"/day/{prev_day}"),
+                ("Latest", "/"),
+                (next_day + " →", f"/day/{next_day}"),
+                ("Cache stats", "/stats"),
+            ],
+        }
+        pages = {
+            "html": Body("text/html; charset=utf-8", build_dashboard_html(data)),
+            "json": Body("application/json", json.dumps(assets, ensure_ascii=False, indent=2)),
+        }
+        for key, _, _ in FILES:
+            pages[key] = Body("text/plain; charset=utf-8", assets[key])
+        return pages
+
+    async def render_async(self, cfg, day):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, self.render, cfg, day)
+
+class Server:
+    def __init__(self, cfg_path, capacity):
+        self.renderer = Renderer(cfg_path)
+        self.cache = DayCache(capacity)
+        self.requests = 0
+        self.not_modified = 0
+        self.started = time.time()
+
+    def route(self, path):
+        """
+        (date, resource) for /day/YYYY-MM-DD[.json|/<channel>], else None.
+        """
+        if not path.startswith("/day/"):
+            return None
+        rest = path[len("/day/"):]
+        resource = "html"
+        if rest.endswith(".json"):
+            rest, resource = rest[:-len(".json")], "json"
+        elif "/" in rest:
+            rest, resource = rest.split("/", 1)
+            if resource not in {key for key, _, _ in FILES}:
+                return None
+        try:
+            return date.fromisoformat(rest), resource
+        except ValueError:
+            return None
+
+    def stats_body(self):
+        data = self.cache.stats()
+        data.update(
+            requests=self.requests,
+            not_modified=self.not_modified,
+            config=self.renderer.cfg.fingerprint,
+            uptime_s=round(time.time() - self.started, 1),
+        )
+        return json.dumps(data, indent=2) + "\n"
+
+    async def respond(self, method, path, headers):
+        """
+        Returns (status, extra headers, Body or None).
+        """
+        path = path.split("?", 1)[0]
+        if path == "/stats":
+            return 200, {"Cache-Control": "no-store"}, Body("application/json", self.stats_body())
+        if path == "/":
+            day = latest_date_from_output() or date.today().isoformat()
+            return 302, {"Location": f"/day/{day}"}, None
+        target = self.route(path)
+        if target is None:
+            return 404, {}, Body("text/plain; charset=utf-8", "Not found. Try /day/YYYY-MM-DD\n")
+
+        day, resource = target
+        cfg = self.renderer.refresh()
+        pages = await self.cache.get((day.isoformat(), cfg.fingerprint),
+                                     lambda: self.renderer.render_async(cfg, day))
+        body = pages[resource]
+        if body.etag in headers.get("if-none-match", ""):
+            self.not_modified += 1
+            return 304, {"ETag": body.etag}, None
+        return 200, {"ETag": body.etag, "Cache-Control": "no-cache"}, body
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), timeout=15)
+                except asyncio.TimeoutError:
+                    break
+                if not line:
+                    break
+                parts = line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = h.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if len(parts) != 3:
+                    break
+                method, path, version = parts
+                self.requests += 1
+
+                if method not in ("GET", "HEAD"):
+                    status, extra, body = 405, {"Allow": "GET, HEAD"}, None
+                else:
+                    try:
+                        status, extra, body = await self.respond(method, path, headers)
+                    except Exception as e:
+                        status, extra, body = 500, {}, Body("text/plain; charset=utf-8", f"{e}\n")
+
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version == "HTTP/1.1")
+                writer.write(self.encode(status, extra, body, headers, method == "HEAD", keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def encode(self, status, extra, body, headers, head_only, keep_alive):
+        reasons = {200: "OK", 302: "Found", 304: "Not Modified", 404: "Not Found",
+                   405: "Method Not Allowed", 500: "Internal Server Error"}
+        out = {"Server": "kr3w", "Connection": "keep-alive" if keep_alive else "close"}
+        out.update(extra)
+        payload = b""
+        if body is not None:
+            accept = headers.get("accept-encoding", "")
+            payload = body.raw
+            if body.br is not None and "br" in accept:
+                payload = body.br
+                out["Content-Encoding"] = "br"
+            elif "gzip" in accept:
+                payload = body.gz
+                out["Content-Encoding"] = "gzip"
+            out["Content-Type"] = body.type
+            out["Vary"] = "Accept-Encoding"
+        out["Content-Length"] = str(len(payload))
+        head = f"HTTP/1.1 {status} {reasons.get(status, '')}\r\n"
+        head += "".join(f"{k}: {v}\r\n" for k, v in out.items()) + "\r\n"
+        return head.encode("latin-1") + (b"" if head_only else payload)
+
+async def serve(host, port, capacity):
+    app = Server(CFG_PATH, capacity)
+    server = await asyncio.start_server(app.handle, host, port)
+    print(f"✅ Serving on http://{host}:{port}/  (stats: /stats, cache: {capacity} day(s))")
+    print(f"   Config: {CFG_PATH}  Output: {OUT_DIR}")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    import argparse
+
+    p = argparse.ArgumentParser(description="Render any day's dashboard on demand")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8787)
+    p.add_argument("--cache", type=int, default=DEFAULT_CACHE_DAYS, help="Days kept in memory (LRU)")
+    args = p.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, max(1, args.cache)))
+    except kr3w_model.ConfigError as e:
+        print(f"❌ Bad config: {e}")
+        raise SystemExit(1)
+    except KeyboardInterrupt:
+        print("👋 Stopped")
+
+if __name__ == "__main__":
+    main()
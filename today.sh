@@ -1,19 +1,20 @@
 #!/data/data/com.termux/files/usr/bin/bash
 set -e
 
-OUT="$HOME/kr3w/output"
+cd "$HOME/kr3w"
 D="$(date +%F)"
 
+# kr3w.py show reads flat files or output/packed/, whichever holds the day
 echo "📝 BLOG (today)"
 echo "----------------"
-cat "$OUT/blog_${D}.md" || echo "No blog file for $D yet."
+python3 kr3w.py show --date "$D" --channel blog || echo "No blog file for $D yet."
 
 echo
 echo "📣 FACEBOOK AD (today)"
 echo "----------------------"
-cat "$OUT/ad_facebook_${D}.txt" || echo "No FB ad file for $D yet."
+python3 kr3w.py show --date "$D" --channel ad_facebook || echo "No FB ad file for $D yet."
 
 echo
 echo "🎬 YOUTUBE POST (today)"
 echo "-----------------------"
-cat "$OUT/youtube_${D}.txt" || echo "No YouTube file for $D yet."
+python3 kr3w.py show --date "$D" --channel youtube || echo "No YouTube file for $D yet."